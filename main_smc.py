@@ -177,41 +177,15 @@ class SMCController:
                         # Get multi-timeframe candles
                         candles_by_tf = {}
                         
-                        # H4 candles
-                        h4_rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H4, 0, 100)
-                        if h4_rates is not None:
-                            candles_by_tf["H4"] = [
-                                {'open': float(r['open']), 'high': float(r['high']),
-                                 'low': float(r['low']), 'close': float(r['close'])}
-                                for r in h4_rates
-                            ]
-                        
-                        # H1 candles
-                        h1_rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, 100)
-                        if h1_rates is not None:
-                            candles_by_tf["H1"] = [
-                                {'open': float(r['open']), 'high': float(r['high']),
-                                 'low': float(r['low']), 'close': float(r['close'])}
-                                for r in h1_rates
-                            ]
-                        
-                        # M15 candles
-                        m15_rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M15, 0, 100)
-                        if m15_rates is not None:
-                            candles_by_tf["M15"] = [
-                                {'open': float(r['open']), 'high': float(r['high']),
-                                 'low': float(r['low']), 'close': float(r['close'])}
-                                for r in m15_rates
-                            ]
-                        
-                        # M5 candles
-                        m5_rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M5, 0, 100)
-                        if m5_rates is not None:
-                            candles_by_tf["M5"] = [
-                                {'open': float(r['open']), 'high': float(r['high']),
-                                 'low': float(r['low']), 'close': float(r['close'])}
-                                for r in m5_rates
-                            ]
+                        # MT5 rates are structured arrays with open/high/low/close
+                        # columns; the SMC detectors consume them directly
+                        for tf_name, mt5_timeframe in (("H4", mt5.TIMEFRAME_H4),
+                                                       ("H1", mt5.TIMEFRAME_H1),
+                                                       ("M15", mt5.TIMEFRAME_M15),
+                                                       ("M5", mt5.TIMEFRAME_M5)):
+                            rates = mt5.copy_rates_from_pos(symbol, mt5_timeframe, 0, 100)
+                            if rates is not None:
+                                candles_by_tf[tf_name] = rates
                         
                         # Get current price
                         tick = mt5.symbol_info_tick(symbol)
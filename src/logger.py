@@ -1,15 +1,20 @@
 """Logging system for trade events and application activity."""
 
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 
 def setup_logger(name: str = "mt5_scalper", log_dir: str = "logs") -> logging.Logger:
     """
     Set up application logger with file and console handlers.
     
+    Records are only enqueued on the calling thread; a background listener
+    does the file and console writes so trading code never blocks on I/O.
+    
     Args:
         name: Logger name
         log_dir: Directory for log files
@@ -50,9 +55,13 @@ def setup_logger(name: str = "mt5_scalper", log_dir: str = "logs") -> logging.Lo
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Hand records to a listener thread that owns the handlers
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued records on exit
+    
+    logger.addHandler(QueueHandler(log_queue))
     
     return logger
 
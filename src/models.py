@@ -1,6 +1,6 @@
 """Data models for MT5 Auto Scalper application."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
@@ -26,7 +26,7 @@ class InstrumentVolatility:
     last_update: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Signal:
     """Trading signal with entry/exit information."""
     symbol: str
@@ -39,7 +39,7 @@ class Signal:
     reason: str  # e.g., "RSI_OVERSOLD_BREAKOUT"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Open trading position."""
     ticket: int
@@ -52,9 +52,13 @@ class Position:
     take_profit: float
     profit: float
     open_time: datetime
+    open_ts: float = field(init=False, repr=False)  # open_time as epoch seconds
 
+    def __post_init__(self):
+        self.open_ts = self.open_time.timestamp()
 
-@dataclass
+
+@dataclass(slots=True)
 class TradeResult:
     """Result of a closed trade."""
     ticket: int
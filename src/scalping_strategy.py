@@ -1,11 +1,21 @@
 """Scalping Strategy for generating entry and exit signals."""
 
 import MetaTrader5 as mt5
+import time
 from typing import Optional, List
 from datetime import datetime, timedelta
 from src.models import Signal, Position
 
 
+# Exit rules evaluated in order: (predicate, exit direction, reason, confidence)
+_EXIT_RULES = (
+    (lambda pos, px: pos.direction == "BUY" and px >= pos.take_profit, "SELL", "TAKE_PROFIT", 1.0),
+    (lambda pos, px: pos.direction == "BUY" and px <= pos.stop_loss, "SELL", "STOP_LOSS", 1.0),
+    (lambda pos, px: pos.direction == "SELL" and px <= pos.take_profit, "BUY", "TAKE_PROFIT", 1.0),
+    (lambda pos, px: pos.direction == "SELL" and px >= pos.stop_loss, "BUY", "STOP_LOSS", 1.0),
+)
+
+
 class ScalpingStrategy:
     """Implements scalping trading logic using RSI and volatility breakout."""
     
@@ -29,6 +39,27 @@ class ScalpingStrategy:
         self.profit_target_multiplier = 3.0
         self.stop_loss_multiplier = 1.0
         self.trailing_stop_enabled = True
+        
+        self._specialize()
+    
+    def _specialize(self) -> None:
+        """
+        Snapshot the parameters read by analyze_entry.
+        
+        Parameters only change through set_parameters, so analyze_entry reads
+        them from this tuple instead of doing an attribute lookup per use.
+        """
+        self._entry_params = (
+            self.rsi_period_fast,
+            self.rsi_period_slow,
+            self.momentum_period_fast,
+            self.momentum_period_slow,
+            self.adx_period,
+            self.atr_period,
+            self.adx_threshold,
+            self.stop_loss_multiplier,
+            self.profit_target_multiplier,
+        )
     
     def calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """
@@ -202,19 +233,26 @@ class ScalpingStrategy:
         if len(candles) < 30:
             return None
         
+        (rsi_period_fast, rsi_period_slow, momentum_period_fast, momentum_period_slow,
+         adx_period, atr_period, adx_threshold, sl_mult, tp_mult) = self._entry_params
+        
         # Extract closing prices
         closes = [c['close'] for c in candles]
         
         # Calculate ALL indicators
-        rsi_fast = self.calculate_rsi(closes, self.rsi_period_fast)  # RSI 9
-        rsi_slow = self.calculate_rsi(closes, self.rsi_period_slow)  # RSI 14
-        momentum_fast = self.calculate_momentum(closes, self.momentum_period_fast)  # Momentum 15
-        momentum_slow = self.calculate_momentum(closes, self.momentum_period_slow)  # Momentum 18
-        adx, plus_di, minus_di = self.calculate_adx(candles, self.adx_period)  # ADX 14
-        atr = self.calculate_atr(candles, self.atr_period)
+        rsi_fast = self.calculate_rsi(closes, rsi_period_fast)  # RSI 9
+        rsi_slow = self.calculate_rsi(closes, rsi_period_slow)  # RSI 14
+        momentum_fast = self.calculate_momentum(closes, momentum_period_fast)  # Momentum 15
+        momentum_slow = self.calculate_momentum(closes, momentum_period_slow)  # Momentum 18
+        adx, plus_di, minus_di = self.calculate_adx(candles, adx_period)  # ADX 14
+        atr = self.calculate_atr(candles, atr_period)
         current_price = candles[-1]['close']
         prev_price = candles[-2]['close']
         
+        # Stop/target distances are shared by every entry signal
+        sl_distance = atr * sl_mult
+        tp_distance = atr * tp_mult
+        
         # Check for sufficient volatility - VERY RELAXED
         if atr / current_price < 0.0001:  # Very low threshold to allow most instruments
             return None
@@ -239,7 +277,7 @@ class ScalpingStrategy:
         
         # === STRONG TREND BUY SIGNAL ===
         # All indicators aligned for strong uptrend
-        if (adx > self.adx_threshold and  # Trend is strong enough
+        if (adx > adx_threshold and  # Trend is strong enough
             plus_di > minus_di and  # Bullish directional movement
             momentum_fast > 0.05 and  # Fast momentum positive (relaxed from 0.08)
             momentum_slow > 0.03 and  # Slow momentum confirms (relaxed from 0.05)
@@ -257,8 +295,8 @@ class ScalpingStrategy:
                 symbol=symbol,
                 direction="BUY",
                 entry_price=current_price,
-                stop_loss=current_price - (atr * self.stop_loss_multiplier),
-                take_profit=current_price + (atr * self.profit_target_multiplier),
+                stop_loss=current_price - sl_distance,
+                take_profit=current_price + tp_distance,
                 timestamp=datetime.now(),
                 confidence=confidence,
                 reason=f"STRONG_TREND_BUY (ADX:{adx:.1f}, RSI9:{rsi_fast:.0f}, RSI14:{rsi_slow:.0f})"
@@ -266,7 +304,7 @@ class ScalpingStrategy:
         
         # === STRONG TREND SELL SIGNAL ===
         # All indicators aligned for strong downtrend
-        if (adx > self.adx_threshold and  # Trend is strong enough
+        if (adx > adx_threshold and  # Trend is strong enough
             minus_di > plus_di and  # Bearish directional movement
             momentum_fast < -0.05 and  # Fast momentum negative (relaxed from -0.08)
             momentum_slow < -0.03 and  # Slow momentum confirms (relaxed from -0.05)
@@ -284,8 +322,8 @@ class ScalpingStrategy:
                 symbol=symbol,
                 direction="SELL",
                 entry_price=current_price,
-                stop_loss=current_price + (atr * self.stop_loss_multiplier),
-                take_profit=current_price - (atr * self.profit_target_multiplier),
+                stop_loss=current_price + sl_distance,
+                take_profit=current_price - tp_distance,
                 timestamp=datetime.now(),
                 confidence=confidence,
                 reason=f"STRONG_TREND_SELL (ADX:{adx:.1f}, RSI9:{rsi_fast:.0f}, RSI14:{rsi_slow:.0f})"
@@ -307,8 +345,8 @@ class ScalpingStrategy:
                 symbol=symbol,
                 direction="BUY",
                 entry_price=current_price,
-                stop_loss=current_price - (atr * self.stop_loss_multiplier),
-                take_profit=current_price + (atr * self.profit_target_multiplier),
+                stop_loss=current_price - sl_distance,
+                take_profit=current_price + tp_distance,
                 timestamp=datetime.now(),
                 confidence=confidence,
                 reason=f"MOMENTUM_BUY (M15:{momentum_fast:.2f}, M18:{momentum_slow:.2f})"
@@ -330,8 +368,8 @@ class ScalpingStrategy:
                 symbol=symbol,
                 direction="SELL",
                 entry_price=current_price,
-                stop_loss=current_price + (atr * self.stop_loss_multiplier),
-                take_profit=current_price - (atr * self.profit_target_multiplier),
+                stop_loss=current_price + sl_distance,
+                take_profit=current_price - tp_distance,
                 timestamp=datetime.now(),
                 confidence=confidence,
                 reason=f"MOMENTUM_SELL (M15:{momentum_fast:.2f}, M18:{momentum_slow:.2f})"
@@ -353,8 +391,8 @@ class ScalpingStrategy:
                 symbol=symbol,
                 direction="BUY",
                 entry_price=current_price,
-                stop_loss=current_price - (atr * self.stop_loss_multiplier),
-                take_profit=current_price + (atr * self.profit_target_multiplier),
+                stop_loss=current_price - sl_distance,
+                take_profit=current_price + tp_distance,
                 timestamp=datetime.now(),
                 confidence=confidence,
                 reason=f"RSI_OVERSOLD_BOUNCE (RSI9:{rsi_fast:.0f}, RSI14:{rsi_slow:.0f})"
@@ -375,8 +413,8 @@ class ScalpingStrategy:
                 symbol=symbol,
                 direction="SELL",
                 entry_price=current_price,
-                stop_loss=current_price + (atr * self.stop_loss_multiplier),
-                take_profit=current_price - (atr * self.profit_target_multiplier),
+                stop_loss=current_price + sl_distance,
+                take_profit=current_price - tp_distance,
                 timestamp=datetime.now(),
                 confidence=confidence,
                 reason=f"RSI_OVERBOUGHT_REVERSAL (RSI9:{rsi_fast:.0f}, RSI14:{rsi_slow:.0f})"
@@ -395,57 +433,10 @@ class ScalpingStrategy:
         Returns:
             Exit signal if conditions met, None otherwise
         """
-        # Check take profit
-        if position.direction == "BUY":
-            if current_price >= position.take_profit:
-                return Signal(
-                    symbol=position.symbol,
-                    direction="SELL",
-                    entry_price=current_price,
-                    stop_loss=0,
-                    take_profit=0,
-                    timestamp=datetime.now(),
-                    confidence=1.0,
-                    reason="TAKE_PROFIT"
-                )
-            
-            # Check stop loss
-            if current_price <= position.stop_loss:
-                return Signal(
-                    symbol=position.symbol,
-                    direction="SELL",
-                    entry_price=current_price,
-                    stop_loss=0,
-                    take_profit=0,
-                    timestamp=datetime.now(),
-                    confidence=1.0,
-                    reason="STOP_LOSS"
-                )
-        
-        elif position.direction == "SELL":
-            if current_price <= position.take_profit:
-                return Signal(
-                    symbol=position.symbol,
-                    direction="BUY",
-                    entry_price=current_price,
-                    stop_loss=0,
-                    take_profit=0,
-                    timestamp=datetime.now(),
-                    confidence=1.0,
-                    reason="TAKE_PROFIT"
-                )
-            
-            if current_price >= position.stop_loss:
-                return Signal(
-                    symbol=position.symbol,
-                    direction="BUY",
-                    entry_price=current_price,
-                    stop_loss=0,
-                    take_profit=0,
-                    timestamp=datetime.now(),
-                    confidence=1.0,
-                    reason="STOP_LOSS"
-                )
+        # Check take profit / stop loss
+        for predicate, exit_direction, reason, confidence in _EXIT_RULES:
+            if predicate(position, current_price):
+                return self._mk_exit(position, current_price, exit_direction, reason, confidence)
         
         # Implement AGGRESSIVE trailing stop if enabled
         if self.trailing_stop_enabled:
@@ -507,8 +498,7 @@ class ScalpingStrategy:
                         return self._create_trailing_stop_update(position, new_stop, "TRAIL_80")
         
         # Check time-based exit (30 minutes for scalping) - only if NOT in profit
-        time_open = (datetime.now() - position.open_time).total_seconds() / 60
-        if time_open >= 30:
+        if time.time() - position.open_ts >= 1800:
             # Check if position is in profit
             is_profitable = False
             if position.direction == "BUY":
@@ -519,19 +509,36 @@ class ScalpingStrategy:
             # Only close on time if not profitable or very small profit
             if not is_profitable or abs(position.profit) < 1.0:
                 exit_direction = "SELL" if position.direction == "BUY" else "BUY"
-                return Signal(
-                    symbol=position.symbol,
-                    direction=exit_direction,
-                    entry_price=current_price,
-                    stop_loss=0,
-                    take_profit=0,
-                    timestamp=datetime.now(),
-                    confidence=0.5,
-                    reason="TIME_EXIT"
-                )
+                return self._mk_exit(position, current_price, exit_direction, "TIME_EXIT", 0.5)
         
         return None
     
+    def _mk_exit(self, position: Position, current_price: float, direction: str,
+                 reason: str, confidence: float) -> Signal:
+        """
+        Create an exit signal for a position.
+        
+        Args:
+            position: Position to close
+            current_price: Current market price
+            direction: Closing direction ("BUY" or "SELL")
+            reason: Exit reason (e.g., "TAKE_PROFIT")
+            confidence: Signal confidence
+            
+        Returns:
+            Exit signal
+        """
+        return Signal(
+            symbol=position.symbol,
+            direction=direction,
+            entry_price=current_price,
+            stop_loss=0,
+            take_profit=0,
+            timestamp=datetime.now(),
+            confidence=confidence,
+            reason=reason
+        )
+    
     def _create_trailing_stop_update(self, position: Position, new_stop: float, stage: str) -> Signal:
         """
         Create a signal to update trailing stop.
@@ -665,3 +672,5 @@ class ScalpingStrategy:
             self.stop_loss_multiplier = stop_loss_multiplier
         if trailing_stop_enabled is not None:
             self.trailing_stop_enabled = trailing_stop_enabled
+        
+        self._specialize()
@@ -1,5 +1,8 @@
 """Configuration for Smart Money Concepts (SMC) Strategy Module."""
 
+from datetime import time
+from typing import Callable, Dict
+
 # Timeframes for multi-timeframe analysis
 SMC_CONFIG = {
     # Analysis timeframes
@@ -73,6 +76,60 @@ SMC_CONFIG = {
 }
 
 
+def _parse_hhmm(value: str) -> time:
+    """Parse an "HH:MM" session bound."""
+    hour, minute = value.split(":")
+    return time(int(hour), int(minute))
+
+
+# Trading sessions with "HH:MM" strings parsed to datetime.time once at import.
+# Missing break times map to None.
+TRADING_SESSION_TIMES = {
+    symbol: {
+        key: _parse_hhmm(schedule[key]) if schedule.get(key) else None
+        for key in ("open", "close", "break_start", "break_end")
+    }
+    for symbol, schedule in SMC_CONFIG["trading_sessions"].items()
+}
+
+
+def minute_of_day(t: time) -> int:
+    """Minutes since midnight (0-1439) for a time of day."""
+    return t.hour * 60 + t.minute
+
+
+def _minute_window(start: time, end: time) -> Callable[[int], bool]:
+    """Membership test for minute-of-day in [start, end), wrapping past midnight."""
+    lo = minute_of_day(start)
+    # Offset from start modulo a day covers both the plain and the
+    # midnight-crossing window with one comparison
+    span = (minute_of_day(end) - lo) % 1440
+    return lambda t: (t - lo) % 1440 < span
+
+
+def _session_checker(schedule: Dict[str, time]) -> Callable[[int, int], bool]:
+    """Build an (hour, minute) -> open test for one parsed session schedule."""
+    in_session = _minute_window(schedule["open"], schedule["close"])
+    if not (schedule["break_start"] and schedule["break_end"]):
+        return lambda hour, minute: in_session(hour * 60 + minute)
+    
+    in_break = _minute_window(schedule["break_start"], schedule["break_end"])
+    
+    def is_open(hour: int, minute: int) -> bool:
+        t = hour * 60 + minute
+        return in_session(t) and not in_break(t)
+    
+    return is_open
+
+
+# Per-symbol session tests specialized on the fixed schedule above.
+# Session times have minute precision, so hour and minute are enough.
+SESSION_CHECKERS = {
+    symbol: _session_checker(schedule)
+    for symbol, schedule in TRADING_SESSION_TIMES.items()
+}
+
+
 # MT5 Timeframe mapping
 MT5_TIMEFRAMES = {
     "M1": 1,
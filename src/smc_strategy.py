@@ -8,10 +8,24 @@ This module implements institutional trading methodology based on:
 - Multi-timeframe Confluence
 """
 
+import logging
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, time
-from typing import List, Optional, Dict
-from src.smc_config import SMC_CONFIG
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from time import monotonic
+from typing import Callable, List, Optional, Dict, Tuple, Union
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import MetaTrader5 as mt5
+except ImportError:  # Windows-only; detectors and analysis run without it
+    mt5 = None
+
+from src.smc_config import SMC_CONFIG, TRADING_SESSION_TIMES, SESSION_CHECKERS, minute_of_day
 from src.logger import logger
 
 
@@ -19,7 +33,11 @@ from src.logger import logger
 # DATA MODELS
 # ============================================================================
 
-@dataclass
+# Zone direction encoded as an int for cheap comparisons
+_DIRECTION_CODES = {"BULLISH": 1, "BEARISH": -1}
+
+
+@dataclass(slots=True)
 class FVG:
     """Fair Value Gap - price imbalance zone."""
     timeframe: str  # "H4", "H1", "M15", "M5"
@@ -30,9 +48,13 @@ class FVG:
     created_at: datetime
     filled: bool
     candle_index: int
+    direction_code: int = field(init=False, repr=False)  # 1 bullish, -1 bearish
+    
+    def __post_init__(self):
+        self.direction_code = _DIRECTION_CODES.get(self.direction, 0)
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderBlock:
     """Order Block - institutional supply/demand zone."""
     timeframe: str
@@ -43,9 +65,13 @@ class OrderBlock:
     created_at: datetime
     valid: bool
     strength: float  # Based on subsequent move size
+    direction_code: int = field(init=False, repr=False)  # 1 bullish, -1 bearish
+    
+    def __post_init__(self):
+        self.direction_code = _DIRECTION_CODES.get(self.direction, 0)
 
 
-@dataclass
+@dataclass(slots=True)
 class BreakerBlock:
     """Breaker Block - failed order block that becomes opposite zone."""
     original_ob: OrderBlock
@@ -56,7 +82,7 @@ class BreakerBlock:
     created_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class LiquidityLevel:
     """Liquidity level - swing high/low where stops accumulate."""
     price: float
@@ -66,28 +92,37 @@ class LiquidityLevel:
     sweep_time: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketStructure:
     """Market structure - trend identification."""
     trend: str  # "UPTREND", "DOWNTREND", "RANGING"
-    swing_highs: List[float] = field(default_factory=list)
-    swing_lows: List[float] = field(default_factory=list)
+    swing_highs: Tuple[float, ...] = ()
+    swing_lows: Tuple[float, ...] = ()
     last_bos: Optional[datetime] = None
     last_choch: Optional[datetime] = None
+    # BOS reference levels: most extreme swing before the latest one
+    previous_high: Optional[float] = field(init=False, repr=False)
+    previous_low: Optional[float] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        highs = self.swing_highs
+        lows = self.swing_lows
+        self.previous_high = (max(highs[:-1]) if len(highs) > 1 else highs[0]) if highs else None
+        self.previous_low = (min(lows[:-1]) if len(lows) > 1 else lows[0]) if lows else None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfluenceZone:
     """Confluence zone - multiple SMC components aligning."""
     high: float
     low: float
     entry_price: float
-    components: List[str]  # ["H4_FVG", "H1_FVG", "ORDER_BLOCK"]
+    components: Tuple[str, ...]  # ("H4_FVG", "H1_FVG", "ORDER_BLOCK")
     confidence: float  # 0.0 to 1.0
     direction: str  # "BULLISH" or "BEARISH"
 
 
-@dataclass
+@dataclass(slots=True)
 class SMCSignal:
     """SMC trading signal with pending order details."""
     symbol: str
@@ -103,7 +138,7 @@ class SMCSignal:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingOrder:
     """Pending order placed at SMC zone."""
     ticket: int
@@ -118,7 +153,7 @@ class PendingOrder:
     smc_setup: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolMapping:
     """Symbol mapping from standard name to broker-specific symbol."""
     standard_name: str  # "US30", "XAUUSD", etc.
@@ -129,7 +164,7 @@ class SymbolMapping:
     max_lot: float
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingSession:
     """Trading session schedule for a symbol."""
     symbol: str
@@ -137,7 +172,316 @@ class TradingSession:
     close_time: time  # Daily close time (GMT)
     break_start: Optional[time]  # Daily break start
     break_end: Optional[time]  # Daily break end
-    trading_days: List[int] = field(default_factory=lambda: [0, 1, 2, 3, 4, 6])  # 0=Monday, 6=Sunday
+    trading_days: Tuple[int, ...] = (0, 1, 2, 3, 4, 6)  # 0=Monday, 6=Sunday
+
+
+# ============================================================================
+# CANDLE ARRAYS
+# ============================================================================
+
+# OHLC candles: a list of dicts, or the structured array returned by
+# mt5.copy_rates_from_pos (fields 'open', 'high', 'low', 'close', ...)
+Candles = Union[List[dict], np.ndarray]
+
+
+@dataclass(slots=True)
+class CandleArrays:
+    """Read-only column arrays for one candle batch, with shared derived arrays."""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    is_green: np.ndarray  # close > open
+    is_red: np.ndarray  # close < open
+    hl_mid: np.ndarray  # (high + low) / 2
+
+
+@dataclass(slots=True)
+class FVGColumns:
+    """Column arrays for a list of FVGs, row i describing fvgs[i]."""
+    low: np.ndarray
+    high: np.ndarray
+    equilibrium: np.ndarray  # float32: only ever a distance-scan key
+    direction: np.ndarray  # int8: 1 bullish, -1 bearish
+
+
+# Single-entry cache: (candles, batch key, arrays)
+_soa_cache: Optional[tuple] = None
+
+
+def _batch_key(candles: Candles) -> tuple:
+    """Cheap identity for a candle batch: its length and a copy of the last candle."""
+    if not len(candles):
+        return (0, None)
+    if isinstance(candles, np.ndarray):
+        return (len(candles), candles[-1].tobytes())
+    return (len(candles), dict(candles[-1]))
+
+
+def _build_candle_arrays(open_: np.ndarray, high: np.ndarray,
+                         low: np.ndarray, close: np.ndarray) -> CandleArrays:
+    """Derive the shared arrays and freeze everything."""
+    arrays = CandleArrays(
+        open=open_,
+        high=high,
+        low=low,
+        close=close,
+        is_green=close > open_,
+        is_red=close < open_,
+        hl_mid=(high + low) / 2
+    )
+    for name in CandleArrays.__slots__:
+        getattr(arrays, name).flags.writeable = False
+    return arrays
+
+
+def candle_arrays(candles: Candles) -> CandleArrays:
+    """
+    Convert OHLC candles into contiguous float64 arrays plus derived arrays.
+    
+    The last conversion is cached, so detectors run on the same candle
+    batch share one conversion. Returned arrays are read-only.
+    
+    Args:
+        candles: OHLC candles
+        
+    Returns:
+        CandleArrays for the batch
+    """
+    global _soa_cache
+    
+    key = _batch_key(candles)
+    cached = _soa_cache
+    if cached is not None and cached[0] is candles and cached[1] == key:
+        return cached[2]
+    
+    if isinstance(candles, np.ndarray):
+        # MT5 rates are already columnar: copy each field out directly
+        columns = (np.ascontiguousarray(candles[name], dtype=np.float64)
+                   for name in ('open', 'high', 'low', 'close'))
+    else:
+        if candles:
+            ohlc = np.array(
+                [(c['open'], c['high'], c['low'], c['close']) for c in candles],
+                dtype=np.float64
+            )
+        else:
+            ohlc = np.empty((0, 4), dtype=np.float64)
+        columns = (np.ascontiguousarray(ohlc[:, k]) for k in range(4))
+    arrays = _build_candle_arrays(*columns)
+    
+    _soa_cache = (candles, key, arrays)
+    return arrays
+
+
+def candles_to_soa(candles: Candles) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Convert OHLC candles into contiguous float64 arrays.
+    
+    Args:
+        candles: OHLC candles
+        
+    Returns:
+        Tuple of (open, high, low, close) read-only arrays
+    """
+    arrays = candle_arrays(candles)
+    return arrays.open, arrays.high, arrays.low, arrays.close
+
+
+def _strict_max_mask(values: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    Mask of centre points strictly above `lookback` neighbours on each side.
+    
+    Works along the last axis, so stacked series are reduced in one pass.
+    Centre points are values[..., lookback:-lookback].
+    """
+    n = values.shape[-1]
+    extremes = sliding_window_view(values, lookback, axis=-1).max(axis=-1)
+    center = values[..., lookback:n - lookback]
+    
+    # Window i covers values[i:i + lookback]: the left side of center j is
+    # window j, the right side is window j + lookback + 1
+    return (extremes[..., :n - 2 * lookback] < center) & (extremes[..., lookback + 1:] < center)
+
+
+def _swing_points(values: np.ndarray, lookback: int, kind: str) -> List[float]:
+    """
+    Find strict swing points using rolling windows.
+    
+    A swing high must be strictly above the `lookback` values on each side
+    (a swing low strictly below).
+    
+    Args:
+        values: High or low price array
+        lookback: Candles to compare on each side
+        kind: "high" or "low"
+        
+    Returns:
+        Swing point prices in candle order
+    """
+    n = len(values)
+    if n <= lookback * 2:
+        return []
+    
+    signed = values if kind == "high" else -values
+    mask = _strict_max_mask(signed, lookback)
+    return values[lookback:n - lookback][mask].tolist()
+
+
+def _swing_highs_lows(high: np.ndarray, low: np.ndarray,
+                      lookback: int) -> Tuple[List[float], List[float]]:
+    """Find swing highs and swing lows with a single stacked window pass."""
+    n = len(high)
+    if n <= lookback * 2:
+        return [], []
+    
+    # Negated lows turn the swing-low test into the same strict-max test
+    mask = _strict_max_mask(np.stack((high, -low)), lookback)
+    return (high[lookback:n - lookback][mask[0]].tolist(),
+            low[lookback:n - lookback][mask[1]].tolist())
+
+
+def _fvg_masks(high: np.ndarray, low: np.ndarray,
+               min_gap: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mark 3-candle FVG patterns along the last axis.
+    
+    Entry i describes candles i, i + 1, i + 2. Stacked series (one row per
+    symbol) are scanned in one pass.
+    
+    Returns:
+        Tuple of (bullish, bearish) masks
+    """
+    # 3-candle patterns: candle 1 = [:-2], candle 3 = [2:]
+    # Bullish FVG: Candle 1 low > Candle 3 high
+    # Bearish FVG: Candle 1 high < Candle 3 low
+    bull_gap = low[..., :-2] - high[..., 2:]
+    bear_gap = low[..., 2:] - high[..., :-2]
+    bullish = (bull_gap > 0) & (bull_gap >= min_gap)
+    bearish = ~bullish & (bear_gap > 0) & (bear_gap >= min_gap)
+    return bullish, bearish
+
+
+def _build_fvgs(high: np.ndarray, low: np.ndarray, bullish: np.ndarray,
+                bearish: np.ndarray, timeframe: str,
+                now: datetime) -> Tuple[List[FVG], FVGColumns]:
+    """Materialize FVG objects, and their column arrays, for one series from its pattern masks."""
+    # Gap bounds for surviving patterns only
+    idx = np.flatnonzero(bullish | bearish)
+    is_bull = bullish[idx]
+    gap_highs = np.where(is_bull, low[idx], low[idx + 2])
+    gap_lows = np.where(is_bull, high[idx + 2], high[idx])
+    columns = FVGColumns(
+        low=gap_lows,
+        high=gap_highs,
+        equilibrium=((gap_highs + gap_lows) / 2).astype(np.float32),
+        direction=np.where(is_bull, 1, -1).astype(np.int8)
+    )
+    
+    fvgs = [
+        FVG(
+            timeframe=timeframe,
+            direction="BULLISH" if bull else "BEARISH",
+            high=fvg_high,
+            low=fvg_low,
+            equilibrium=(fvg_high + fvg_low) / 2,
+            created_at=now,
+            filled=False,
+            candle_index=i
+        )
+        for i, bull, fvg_high, fvg_low in zip(idx.tolist(), is_bull.tolist(),
+                                              gap_highs.tolist(), gap_lows.tolist())
+    ]
+    return fvgs, columns
+
+
+def _equilibria(fvgs: List[FVG]) -> np.ndarray:
+    """
+    Equilibrium levels of the given FVGs as a float32 array.
+    
+    Only used to rank FVGs by distance; prices handed on always come from
+    the FVG objects themselves, so single precision is enough here.
+    """
+    return np.fromiter((fvg.equilibrium for fvg in fvgs), dtype=np.float32, count=len(fvgs))
+
+
+def fvg_columns(fvgs: List[FVG]) -> FVGColumns:
+    """
+    Pack FVG bounds and directions into column arrays.
+    
+    Args:
+        fvgs: FVGs in list order
+        
+    Returns:
+        FVGColumns with one row per FVG
+    """
+    n = len(fvgs)
+    return FVGColumns(
+        low=np.fromiter((fvg.low for fvg in fvgs), dtype=np.float64, count=n),
+        high=np.fromiter((fvg.high for fvg in fvgs), dtype=np.float64, count=n),
+        equilibrium=_equilibria(fvgs),
+        direction=np.fromiter((fvg.direction_code for fvg in fvgs), dtype=np.int8, count=n)
+    )
+
+
+@lru_cache(maxsize=16)
+def _htf_bias_decision(h4_trend: str, h1_trend: str) -> Tuple[str, str]:
+    """
+    Decide HTF bias from H4 and H1 trends.
+    
+    Pure in its inputs, so each trend combination is decided once.
+    
+    Returns:
+        Tuple of (bias, reason for the decision)
+    """
+    # Both timeframes agree
+    if h4_trend == "UPTREND" and h1_trend == "UPTREND":
+        return "BULLISH", "both timeframes agree on UPTREND"
+    elif h4_trend == "DOWNTREND" and h1_trend == "DOWNTREND":
+        return "BEARISH", "both timeframes agree on DOWNTREND"
+    
+    # H4 takes priority if it has a clear trend
+    if h4_trend == "UPTREND":
+        return "BULLISH", "H4 priority - H4 UPTREND"
+    elif h4_trend == "DOWNTREND":
+        return "BEARISH", "H4 priority - H4 DOWNTREND"
+    
+    # H1 fallback: if H4 is ranging but H1 has a clear trend
+    if h4_trend == "RANGING":
+        if h1_trend == "UPTREND":
+            return "BULLISH", "H1 fallback - H4 RANGING, H1 UPTREND"
+        elif h1_trend == "DOWNTREND":
+            return "BEARISH", "H1 fallback - H4 RANGING, H1 DOWNTREND"
+    
+    # Both ranging or no clear direction
+    return "NEUTRAL", "both timeframes ranging or unclear"
+
+
+def _order_block_indices(is_green: np.ndarray, is_red: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate order block candles.
+    
+    A bullish order block is a red candle followed by 3 green candles; a
+    bearish one is a green candle followed by 3 red candles. Candles without
+    a 4th candle after them are not considered.
+    
+    Args:
+        is_green: Candles closing above their open
+        is_red: Candles closing below their open
+        
+    Returns:
+        Tuple of (candle indices, bullish flags) in candle order
+    """
+    m = len(is_green) - 4
+    if m <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+    
+    # Look for significant moves (3 consecutive candles in same direction)
+    bullish = is_red[:m] & is_green[1:m + 1] & is_green[2:m + 2] & is_green[3:m + 3]
+    bearish = is_green[:m] & is_red[1:m + 1] & is_red[2:m + 2] & is_red[3:m + 3]
+    
+    indices = np.flatnonzero(bullish | bearish)
+    return indices, bullish[indices]
 
 
 # ============================================================================
@@ -149,65 +493,108 @@ class FVGDetector:
     
     def __init__(self):
         self.min_gap_size = SMC_CONFIG["fvg_min_size_pips"]
-        self.cached_fvgs: Dict[str, List[FVG]] = {}  # Cache by symbol_timeframe
+        # One entry per (symbol, timeframe): (batch key, FVGs, columns), least recently used first
+        self.cached_fvgs: OrderedDict[Tuple[str, str], Tuple[tuple, List[FVG], FVGColumns]] = OrderedDict()
+        self.max_cached = 64
+        # Timeframes may be analyzed on worker threads
+        self._cache_lock = threading.Lock()
         logger.info("FVGDetector initialized")
     
-    def detect_fvgs(self, candles: List[dict], timeframe: str) -> List[FVG]:
+    def detect_fvgs(self, candles: Candles, timeframe: str,
+                    symbol: Optional[str] = None) -> List[FVG]:
         """
         Detect Fair Value Gaps in price data.
         
+        When a symbol is given, the result is memoized per symbol and timeframe
+        until a new or changed last candle arrives.
+        
         Args:
-            candles: List of OHLC candles
+            candles: OHLC candles
             timeframe: Timeframe string (H4, H1, M15, M5)
+            symbol: Optional symbol name used as memo key
             
         Returns:
             List of detected FVGs
         """
-        fvgs = []
-        
+        fvgs, _ = self.detect_fvgs_with_columns(candles, timeframe, symbol)
+        return fvgs
+    
+    def detect_fvgs_with_columns(self, candles: Candles, timeframe: str,
+                                 symbol: Optional[str] = None) -> Tuple[List[FVG], FVGColumns]:
+        """Detect Fair Value Gaps, also returning their column arrays (memoized alongside)."""
         if len(candles) < 3:
-            return fvgs
+            return [], fvg_columns([])
+        
+        if symbol is not None:
+            cache_key = (symbol, timeframe)
+            batch_key = _batch_key(candles)
+            with self._cache_lock:
+                cached = self.cached_fvgs.get(cache_key)
+                if cached is not None and cached[0] == batch_key:
+                    self.cached_fvgs.move_to_end(cache_key)
+                    return list(cached[1]), cached[2]
+        
+        _, high, low, _ = candles_to_soa(candles)
+        bullish, bearish = _fvg_masks(high, low, self.min_gap_size / 10000)
+        fvgs, columns = _build_fvgs(high, low, bullish, bearish, timeframe, datetime.now())
         
-        # Scan for 3-candle FVG patterns
-        for i in range(len(candles) - 2):
-            candle1 = candles[i]
-            candle2 = candles[i + 1]
-            candle3 = candles[i + 2]
+        if symbol is not None:
+            self._remember(cache_key, batch_key, fvgs, columns)
+        
+        logger.info("Detected %s FVGs on %s", len(fvgs), timeframe)
+        return fvgs, columns
+    
+    def detect_fvgs_batch(self, candles_by_symbol: Dict[str, Candles],
+                          timeframe: str) -> Dict[str, List[FVG]]:
+        """
+        Detect Fair Value Gaps for several symbols on one timeframe.
+        
+        Symbols with the same candle count are stacked and scanned in a
+        single array pass. Results are memoized per symbol exactly as in
+        detect_fvgs, so later detect_fvgs calls on the same batches are
+        cache hits.
+        
+        Args:
+            candles_by_symbol: OHLC candles for each symbol
+            timeframe: Timeframe string (H4, H1, M15, M5)
             
-            # Bullish FVG: Candle 1 low > Candle 3 high
-            if candle1['low'] > candle3['high']:
-                gap_size = candle1['low'] - candle3['high']
-                
-                fvg = FVG(
-                    timeframe=timeframe,
-                    direction="BULLISH",
-                    high=candle1['low'],
-                    low=candle3['high'],
-                    equilibrium=(candle1['low'] + candle3['high']) / 2,
-                    created_at=datetime.now(),
-                    filled=False,
-                    candle_index=i
-                )
-                fvgs.append(fvg)
+        Returns:
+            Dictionary mapping symbol to its detected FVGs
+        """
+        results: Dict[str, List[FVG]] = {}
+        by_length: Dict[int, List[str]] = {}
+        for symbol, candles in candles_by_symbol.items():
+            if len(candles) < 3:
+                results[symbol] = []
+            else:
+                by_length.setdefault(len(candles), []).append(symbol)
+        
+        min_gap = self.min_gap_size / 10000
+        now = datetime.now()
+        for symbols in by_length.values():
+            columns = [candles_to_soa(candles_by_symbol[symbol]) for symbol in symbols]
+            high = np.stack([c[1] for c in columns])
+            low = np.stack([c[2] for c in columns])
+            bullish, bearish = _fvg_masks(high, low, min_gap)
             
-            # Bearish FVG: Candle 1 high < Candle 3 low
-            elif candle1['high'] < candle3['low']:
-                gap_size = candle3['low'] - candle1['high']
-                
-                fvg = FVG(
-                    timeframe=timeframe,
-                    direction="BEARISH",
-                    high=candle3['low'],
-                    low=candle1['high'],
-                    equilibrium=(candle3['low'] + candle1['high']) / 2,
-                    created_at=datetime.now(),
-                    filled=False,
-                    candle_index=i
-                )
-                fvgs.append(fvg)
-        
-        logger.info(f"Detected {len(fvgs)} FVGs on {timeframe}")
-        return fvgs
+            for row, symbol in enumerate(symbols):
+                fvgs, fvg_cols = _build_fvgs(high[row], low[row], bullish[row], bearish[row],
+                                             timeframe, now)
+                self._remember((symbol, timeframe), _batch_key(candles_by_symbol[symbol]),
+                               fvgs, fvg_cols)
+                results[symbol] = fvgs
+        
+        logger.info("Detected FVGs for %s symbols on %s", len(results), timeframe)
+        return results
+    
+    def _remember(self, cache_key: Tuple[str, str], batch_key: tuple, fvgs: List[FVG],
+                  columns: FVGColumns) -> None:
+        """Memoize FVGs for a (symbol, timeframe), evicting the least recently used entry."""
+        with self._cache_lock:
+            self.cached_fvgs[cache_key] = (batch_key, list(fvgs), columns)
+            self.cached_fvgs.move_to_end(cache_key)
+            if len(self.cached_fvgs) > self.max_cached:
+                self.cached_fvgs.popitem(last=False)
     
     def is_fvg_filled(self, fvg: FVG, current_price: float) -> bool:
         """
@@ -220,7 +607,7 @@ class FVGDetector:
         Returns:
             True if FVG is filled, False otherwise
         """
-        if fvg.direction == "BULLISH":
+        if fvg.direction_code == 1:
             # Bullish FVG filled when price drops into/below the gap
             return current_price <= fvg.low
         else:  # BEARISH
@@ -245,15 +632,18 @@ class FVGDetector:
     
     def calculate_fvg_equilibrium(self, fvg: FVG) -> float:
         """
-        Calculate 50% equilibrium level of FVG.
+        Get 50% equilibrium level of FVG.
+        
+        The level is computed when the FVG is created, so this just reads
+        the stored field.
         
         Args:
-            fvg: FVG to calculate equilibrium for
+            fvg: FVG to get equilibrium for
             
         Returns:
             Equilibrium price (50% level)
         """
-        return (fvg.high + fvg.low) / 2
+        return fvg.equilibrium
     
     def filter_valid_fvgs(self, fvgs: List[FVG]) -> List[FVG]:
         """
@@ -292,19 +682,24 @@ class FVGDetector:
         Returns:
             Nearest FVG or None
         """
-        valid_fvgs = self.filter_valid_fvgs(fvgs)
+        if not fvgs:
+            return None
         
+        # Unfilled FVGs (in the requested direction) as one mask over the columns
+        columns = fvg_columns(fvgs)
+        keep = np.fromiter((not fvg.filled for fvg in fvgs), dtype=bool, count=len(fvgs))
         if direction:
-            valid_fvgs = [fvg for fvg in valid_fvgs if fvg.direction == direction]
+            keep &= columns.direction == _DIRECTION_CODES.get(direction, 0)
+        candidates = np.flatnonzero(keep)
         
-        if not valid_fvgs:
+        if not len(candidates):
             return None
         
         # Find nearest by equilibrium distance
-        nearest = min(valid_fvgs, key=lambda fvg: abs(fvg.equilibrium - current_price))
-        return nearest
+        distances = np.abs(columns.equilibrium[candidates] - current_price)
+        return fvgs[int(candidates[np.argmin(distances)])]
     
-    def detect_volume_imbalances(self, candles: List[dict], timeframe: str) -> List[FVG]:
+    def detect_volume_imbalances(self, candles: Candles, timeframe: str) -> List[FVG]:
         """
         Detect Volume Imbalances (same as FVGs).
         
@@ -312,7 +707,7 @@ class FVGDetector:
         They are essentially the same as Fair Value Gaps.
         
         Args:
-            candles: List of OHLC candles
+            candles: OHLC candles
             timeframe: Timeframe string
             
         Returns:
@@ -332,7 +727,12 @@ class FVGDetector:
         Returns:
             Sorted list of FVGs (nearest first)
         """
-        return sorted(fvgs, key=lambda fvg: abs(fvg.equilibrium - current_price))
+        if not fvgs:
+            return []
+        
+        # Stable sort keeps detection order for equal distances
+        distances = np.abs(_equilibria(fvgs) - current_price)
+        return [fvgs[i] for i in np.argsort(distances, kind="stable").tolist()]
 
 
 # ============================================================================
@@ -346,12 +746,12 @@ class OrderBlockDetector:
         self.min_move_pips = SMC_CONFIG["order_block_min_move"]
         logger.info("OrderBlockDetector initialized")
     
-    def detect_order_blocks(self, candles: List[dict]) -> List[OrderBlock]:
+    def detect_order_blocks(self, candles: Candles) -> List[OrderBlock]:
         """
         Detect Order Blocks in price data.
         
         Args:
-            candles: List of OHLC candles
+            candles: OHLC candles
             
         Returns:
             List of detected Order Blocks
@@ -361,96 +761,77 @@ class OrderBlockDetector:
         if len(candles) < 5:
             return order_blocks
         
-        # Look for significant moves (3+ consecutive candles in same direction)
-        for i in range(len(candles) - 4):
-            # Check for bullish move (3+ green candles)
-            bullish_move = all(
-                candles[i + j + 1]['close'] > candles[i + j + 1]['open']
-                for j in range(3)
-            )
-            
-            if bullish_move:
-                # Last red candle before move is the Order Block
-                if candles[i]['close'] < candles[i]['open']:
-                    ob = OrderBlock(
-                        timeframe="",  # Will be set by caller
-                        direction="BULLISH",
-                        high=candles[i]['high'],
-                        low=candles[i]['low'],
-                        entry_price=(candles[i]['high'] + candles[i]['low']) / 2,
-                        created_at=datetime.now(),
-                        valid=True,
-                        strength=candles[i + 3]['close'] - candles[i]['close']
-                    )
-                    order_blocks.append(ob)
-            
-            # Check for bearish move (3+ red candles)
-            bearish_move = all(
-                candles[i + j + 1]['close'] < candles[i + j + 1]['open']
-                for j in range(3)
+        arrays = candle_arrays(candles)
+        close = arrays.close
+        indices, is_bullish = _order_block_indices(arrays.is_green, arrays.is_red)
+        
+        # Gather only the order block candles; strength is the 3-candle move
+        # in the block's direction
+        move = close[indices + 3] - close[indices]
+        strengths = np.where(is_bullish, move, -move)
+        now = datetime.now()
+        
+        for bullish, ob_high, ob_low, entry, strength in zip(
+                is_bullish.tolist(), arrays.high[indices].tolist(), arrays.low[indices].tolist(),
+                arrays.hl_mid[indices].tolist(), strengths.tolist()):
+            ob = OrderBlock(
+                timeframe="",  # Will be set by caller
+                direction="BULLISH" if bullish else "BEARISH",
+                high=ob_high,
+                low=ob_low,
+                entry_price=entry,
+                created_at=now,
+                valid=True,
+                strength=strength
             )
-            
-            if bearish_move:
-                # Last green candle before move is the Order Block
-                if candles[i]['close'] > candles[i]['open']:
-                    ob = OrderBlock(
-                        timeframe="",  # Will be set by caller
-                        direction="BEARISH",
-                        high=candles[i]['high'],
-                        low=candles[i]['low'],
-                        entry_price=(candles[i]['high'] + candles[i]['low']) / 2,
-                        created_at=datetime.now(),
-                        valid=True,
-                        strength=candles[i]['close'] - candles[i + 3]['close']
-                    )
-                    order_blocks.append(ob)
+            order_blocks.append(ob)
         
-        logger.info(f"Detected {len(order_blocks)} Order Blocks")
+        logger.info("Detected %s Order Blocks", len(order_blocks))
         return order_blocks
     
     def detect_breaker_blocks(self, order_blocks: List[OrderBlock], 
-                             candles: List[dict]) -> List[BreakerBlock]:
+                             candles: Candles) -> List[BreakerBlock]:
         """Detect Breaker Blocks (failed Order Blocks)."""
         breaker_blocks = []
         
+        # An OB is broken if any close went through it, so the extreme
+        # closes answer every OB in O(1)
+        _, _, _, close = candles_to_soa(candles)
+        lowest_close = float(close.min()) if len(close) else float("inf")
+        highest_close = float(close.max()) if len(close) else float("-inf")
+        now = datetime.now()
+        
         # Check if any Order Blocks have been broken
         for ob in order_blocks:
             if not ob.valid:
                 continue
             
-            # Check if price broke through the OB
-            for candle in candles:
-                if ob.direction == "BULLISH":
-                    # Bullish OB broken if price closes below low
-                    if candle['close'] < ob.low:
-                        bb = BreakerBlock(
-                            original_ob=ob,
-                            direction="BEARISH",  # Opposite
-                            high=ob.high,
-                            low=ob.low,
-                            entry_price=ob.entry_price,
-                            created_at=datetime.now()
-                        )
-                        breaker_blocks.append(bb)
-                        ob.valid = False
-                        break
-                
-                elif ob.direction == "BEARISH":
-                    # Bearish OB broken if price closes above high
-                    if candle['close'] > ob.high:
-                        bb = BreakerBlock(
-                            original_ob=ob,
-                            direction="BULLISH",  # Opposite
-                            high=ob.high,
-                            low=ob.low,
-                            entry_price=ob.entry_price,
-                            created_at=datetime.now()
-                        )
-                        breaker_blocks.append(bb)
-                        ob.valid = False
-                        break
+            code = ob.direction_code
+            if code == 1:
+                # Bullish OB broken if price closes below low
+                if lowest_close >= ob.low:
+                    continue
+                direction = "BEARISH"  # Opposite
+            elif code == -1:
+                # Bearish OB broken if price closes above high
+                if highest_close <= ob.high:
+                    continue
+                direction = "BULLISH"  # Opposite
+            else:
+                continue
+            
+            bb = BreakerBlock(
+                original_ob=ob,
+                direction=direction,
+                high=ob.high,
+                low=ob.low,
+                entry_price=ob.entry_price,
+                created_at=now
+            )
+            breaker_blocks.append(bb)
+            ob.valid = False
         
-        logger.info(f"Detected {len(breaker_blocks)} Breaker Blocks")
+        logger.info("Detected %s Breaker Blocks", len(breaker_blocks))
         return breaker_blocks
     
     def get_order_block_entry(self, ob: OrderBlock) -> float:
@@ -459,7 +840,7 @@ class OrderBlockDetector:
     
     def is_order_block_valid(self, ob: OrderBlock, current_price: float) -> bool:
         """Check if Order Block is still valid (not broken)."""
-        if ob.direction == "BULLISH":
+        if ob.direction_code == 1:
             return current_price >= ob.low
         else:  # BEARISH
             return current_price <= ob.high
@@ -474,23 +855,29 @@ class MarketStructureAnalyzer:
     
     def __init__(self):
         self.swing_lookback = 5  # Candles to look back for swing points
+        self._cache: Optional[tuple] = None  # (candles, batch key, structure)
         logger.info("MarketStructureAnalyzer initialized")
     
-    def identify_structure(self, candles: List[dict]) -> MarketStructure:
+    def identify_structure(self, candles: Candles) -> MarketStructure:
         """
         Identify market structure from price data.
         
         Args:
-            candles: List of OHLC candles
+            candles: OHLC candles
             
         Returns:
             MarketStructure object
         """
+        key = _batch_key(candles)
+        cached = self._cache
+        if cached is not None and cached[0] is candles and cached[1] == key:
+            return cached[2]
+        
         if len(candles) < self.swing_lookback * 2:
             return MarketStructure(
                 trend="RANGING",
-                swing_highs=[],
-                swing_lows=[],
+                swing_highs=(),
+                swing_lows=(),
                 last_bos=None,
                 last_choch=None
             )
@@ -504,51 +891,24 @@ class MarketStructureAnalyzer:
         
         structure = MarketStructure(
             trend=trend,
-            swing_highs=swing_highs,
-            swing_lows=swing_lows,
+            swing_highs=tuple(swing_highs),
+            swing_lows=tuple(swing_lows),
             last_bos=None,
             last_choch=None
         )
         
+        self._cache = (candles, key, structure)
         return structure
     
-    def _find_swing_highs(self, candles: List[dict]) -> List[float]:
+    def _find_swing_highs(self, candles: Candles) -> List[float]:
         """Find swing high points in price data."""
-        swing_highs = []
-        
-        for i in range(self.swing_lookback, len(candles) - self.swing_lookback):
-            current_high = candles[i]['high']
-            
-            # Check if this is a local high
-            is_swing_high = True
-            for j in range(1, self.swing_lookback + 1):
-                if candles[i - j]['high'] >= current_high or candles[i + j]['high'] >= current_high:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                swing_highs.append(current_high)
-        
-        return swing_highs
+        _, high, _, _ = candles_to_soa(candles)
+        return _swing_points(high, self.swing_lookback, "high")
     
-    def _find_swing_lows(self, candles: List[dict]) -> List[float]:
+    def _find_swing_lows(self, candles: Candles) -> List[float]:
         """Find swing low points in price data."""
-        swing_lows = []
-        
-        for i in range(self.swing_lookback, len(candles) - self.swing_lookback):
-            current_low = candles[i]['low']
-            
-            # Check if this is a local low
-            is_swing_low = True
-            for j in range(1, self.swing_lookback + 1):
-                if candles[i - j]['low'] <= current_low or candles[i + j]['low'] <= current_low:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                swing_lows.append(current_low)
-        
-        return swing_lows
+        _, _, low, _ = candles_to_soa(candles)
+        return _swing_points(low, self.swing_lookback, "low")
     
     def _determine_trend(self, swing_highs: List[float], swing_lows: List[float]) -> str:
         """
@@ -579,12 +939,12 @@ class MarketStructureAnalyzer:
         else:
             return "RANGING"
     
-    def detect_bos(self, candles: List[dict]) -> Optional[datetime]:
+    def detect_bos(self, candles: Candles) -> Optional[datetime]:
         """
         Detect Break of Structure.
         
         Args:
-            candles: List of OHLC candles
+            candles: OHLC candles
             
         Returns:
             Datetime of BOS or None
@@ -601,24 +961,22 @@ class MarketStructureAnalyzer:
         
         if structure.trend == "UPTREND" and structure.swing_highs:
             # BOS in uptrend: break above previous high
-            previous_high = max(structure.swing_highs[:-1]) if len(structure.swing_highs) > 1 else structure.swing_highs[0]
-            if current_price > previous_high:
+            if current_price > structure.previous_high:
                 return datetime.now()
         
         elif structure.trend == "DOWNTREND" and structure.swing_lows:
             # BOS in downtrend: break below previous low
-            previous_low = min(structure.swing_lows[:-1]) if len(structure.swing_lows) > 1 else structure.swing_lows[0]
-            if current_price < previous_low:
+            if current_price < structure.previous_low:
                 return datetime.now()
         
         return None
     
-    def detect_choch(self, candles: List[dict]) -> Optional[datetime]:
+    def detect_choch(self, candles: Candles) -> Optional[datetime]:
         """
         Detect Change of Character.
         
         Args:
-            candles: List of OHLC candles
+            candles: OHLC candles
             
         Returns:
             Datetime of CHoCH or None
@@ -663,70 +1021,69 @@ class LiquidityAnalyzer:
     
     def __init__(self):
         self.sweep_threshold_pips = SMC_CONFIG["liquidity_sweep_threshold_pips"]
+        self._sweep_threshold = self.sweep_threshold_pips / 10000
+        self._cache: Optional[tuple] = None  # (candles, batch key, (buyside, sellside))
         logger.info("LiquidityAnalyzer initialized")
     
-    def identify_liquidity_levels(self, candles: List[dict]) -> List[LiquidityLevel]:
+    def identify_liquidity_levels(self, candles: Candles) -> List[LiquidityLevel]:
         """
         Identify liquidity levels (swing highs/lows).
         
         Args:
-            candles: List of OHLC candles
+            candles: OHLC candles
             
         Returns:
             List of liquidity levels
         """
-        levels = []
+        buyside, sellside = self._levels_by_side(candles)
+        return buyside + sellside
+    
+    def _levels_by_side(self, candles: Candles) -> Tuple[List[LiquidityLevel], List[LiquidityLevel]]:
+        """Buyside and sellside liquidity levels, cached per candle batch."""
+        key = _batch_key(candles)
+        cached = self._cache
+        if cached is not None and cached[0] is candles and cached[1] == key:
+            return cached[2]
+        
+        buyside = []
+        sellside = []
         lookback = 5
         
         if len(candles) < lookback * 2:
-            return levels
-        
-        # Find swing highs (buyside liquidity)
-        for i in range(lookback, len(candles) - lookback):
-            current_high = candles[i]['high']
-            
-            is_swing_high = True
-            for j in range(1, lookback + 1):
-                if candles[i - j]['high'] >= current_high or candles[i + j]['high'] >= current_high:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                level = LiquidityLevel(
-                    price=current_high,
-                    type="BUYSIDE",
-                    strength=1,
-                    swept=False
-                )
-                levels.append(level)
-        
-        # Find swing lows (sellside liquidity)
-        for i in range(lookback, len(candles) - lookback):
-            current_low = candles[i]['low']
-            
-            is_swing_low = True
-            for j in range(1, lookback + 1):
-                if candles[i - j]['low'] <= current_low or candles[i + j]['low'] <= current_low:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                level = LiquidityLevel(
-                    price=current_low,
-                    type="SELLSIDE",
-                    strength=1,
-                    swept=False
-                )
-                levels.append(level)
+            return buyside, sellside
+        
+        _, high, low, _ = candles_to_soa(candles)
+        swing_highs, swing_lows = _swing_highs_lows(high, low, lookback)
+        
+        # Swing highs are buyside liquidity
+        for price in swing_highs:
+            level = LiquidityLevel(
+                price=price,
+                type="BUYSIDE",
+                strength=1,
+                swept=False
+            )
+            buyside.append(level)
+        
+        # Swing lows are sellside liquidity
+        for price in swing_lows:
+            level = LiquidityLevel(
+                price=price,
+                type="SELLSIDE",
+                strength=1,
+                swept=False
+            )
+            sellside.append(level)
         
-        return levels
+        self._cache = (candles, key, (buyside, sellside))
+        return buyside, sellside
     
-    def detect_sweep(self, candles: List[dict], level: LiquidityLevel) -> Optional[datetime]:
+    def detect_sweep(self, candles: Candles, level: LiquidityLevel) -> Optional[datetime]:
         """
         Detect if liquidity level has been swept.
         
         Args:
-            candles: List of OHLC candles
+            candles: OHLC candles
             level: Liquidity level to check
             
         Returns:
@@ -735,53 +1092,36 @@ class LiquidityAnalyzer:
         if len(candles) < 2:
             return None
         
-        recent_candles = candles[-5:]  # Check last 5 candles
+        arrays = candle_arrays(candles)
+        close = arrays.close[-5:]  # Check last 5 candles
         
-        for candle in recent_candles:
-            if level.type == "BUYSIDE":
-                # Buyside sweep: price breaks above level then reverses
-                if candle['high'] > level.price + (self.sweep_threshold_pips / 10000):
-                    # Check if reversed
-                    if candle['close'] < level.price:
-                        return datetime.now()
-            
-            elif level.type == "SELLSIDE":
-                # Sellside sweep: price breaks below level then reverses
-                if candle['low'] < level.price - (self.sweep_threshold_pips / 10000):
-                    # Check if reversed
-                    if candle['close'] > level.price:
-                        return datetime.now()
+        if level.type == "BUYSIDE":
+            # Buyside sweep: price breaks above level then reverses below it
+            swept = (arrays.high[-5:] > level.price + self._sweep_threshold) & (close < level.price)
+        elif level.type == "SELLSIDE":
+            # Sellside sweep: price breaks below level then reverses above it
+            swept = (arrays.low[-5:] < level.price - self._sweep_threshold) & (close > level.price)
+        else:
+            return None
         
-        return None
+        return datetime.now() if swept.any() else None
     
-    def is_buyside_liquidity_swept(self, candles: List[dict]) -> bool:
+    def is_buyside_liquidity_swept(self, candles: Candles) -> bool:
         """Check if buyside liquidity has been swept recently."""
-        levels = self.identify_liquidity_levels(candles)
-        buyside_levels = [l for l in levels if l.type == "BUYSIDE"]
-        
-        for level in buyside_levels:
-            if self.detect_sweep(candles, level):
-                return True
-        
-        return False
+        buyside_levels, _ = self._levels_by_side(candles)
+        return any(self.detect_sweep(candles, level) for level in buyside_levels)
     
-    def is_sellside_liquidity_swept(self, candles: List[dict]) -> bool:
+    def is_sellside_liquidity_swept(self, candles: Candles) -> bool:
         """Check if sellside liquidity has been swept recently."""
-        levels = self.identify_liquidity_levels(candles)
-        sellside_levels = [l for l in levels if l.type == "SELLSIDE"]
-        
-        for level in sellside_levels:
-            if self.detect_sweep(candles, level):
-                return True
-        
-        return False
+        _, sellside_levels = self._levels_by_side(candles)
+        return any(self.detect_sweep(candles, level) for level in sellside_levels)
 
 
 # ============================================================================
 # MULTI-TIMEFRAME ANALYZER
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class TimeframeAnalysis:
     """Analysis results for all timeframes."""
     h4_fvgs: List[FVG] = field(default_factory=list)
@@ -792,6 +1132,11 @@ class TimeframeAnalysis:
     h1_structure: Optional[MarketStructure] = None
     h4_bias: str = "NEUTRAL"
     h1_bias: str = "NEUTRAL"
+    # Column views of the FVG lists, filled by analyze_all_timeframes
+    h4_fvg_columns: Optional[FVGColumns] = None
+    h1_fvg_columns: Optional[FVGColumns] = None
+    m15_fvg_columns: Optional[FVGColumns] = None
+    m5_fvg_columns: Optional[FVGColumns] = None
 
 
 class MultiTimeframeAnalyzer:
@@ -801,9 +1146,11 @@ class MultiTimeframeAnalyzer:
         self.fvg_detector = fvg_detector
         self.structure_analyzer = structure_analyzer
         self.timeframes = SMC_CONFIG["timeframes"]
+        # Timeframes are independent, so they are analyzed concurrently
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="smc-tf")
         logger.info("MultiTimeframeAnalyzer initialized")
     
-    def analyze_all_timeframes(self, symbol: str, candles_by_tf: Dict[str, List[dict]]) -> TimeframeAnalysis:
+    def analyze_all_timeframes(self, symbol: str, candles_by_tf: Dict[str, Candles]) -> TimeframeAnalysis:
         """
         Analyze all timeframes for a symbol.
         
@@ -816,29 +1163,39 @@ class MultiTimeframeAnalyzer:
         """
         analysis = TimeframeAnalysis()
         
-        # Analyze H4
-        if "H4" in candles_by_tf and candles_by_tf["H4"]:
-            analysis.h4_fvgs = self.fvg_detector.detect_fvgs(candles_by_tf["H4"], "H4")
-            analysis.h4_structure = self.structure_analyzer.identify_structure(candles_by_tf["H4"])
+        # One task per timeframe; structure is only needed for H4 and H1
+        futures = {}
+        for timeframe in ("H4", "H1", "M15", "M5"):
+            candles = candles_by_tf.get(timeframe)
+            if candles is not None and len(candles):
+                futures[timeframe] = self._executor.submit(
+                    self._analyze_timeframe, symbol, timeframe, candles, timeframe in ("H4", "H1")
+                )
+        
+        if "H4" in futures:
+            analysis.h4_fvgs, analysis.h4_fvg_columns, analysis.h4_structure = futures["H4"].result()
             analysis.h4_bias = analysis.h4_structure.trend if analysis.h4_structure else "NEUTRAL"
         
-        # Analyze H1
-        if "H1" in candles_by_tf and candles_by_tf["H1"]:
-            analysis.h1_fvgs = self.fvg_detector.detect_fvgs(candles_by_tf["H1"], "H1")
-            analysis.h1_structure = self.structure_analyzer.identify_structure(candles_by_tf["H1"])
+        if "H1" in futures:
+            analysis.h1_fvgs, analysis.h1_fvg_columns, analysis.h1_structure = futures["H1"].result()
             analysis.h1_bias = analysis.h1_structure.trend if analysis.h1_structure else "NEUTRAL"
         
-        # Analyze M15
-        if "M15" in candles_by_tf and candles_by_tf["M15"]:
-            analysis.m15_fvgs = self.fvg_detector.detect_fvgs(candles_by_tf["M15"], "M15")
+        if "M15" in futures:
+            analysis.m15_fvgs, analysis.m15_fvg_columns, _ = futures["M15"].result()
         
-        # Analyze M5
-        if "M5" in candles_by_tf and candles_by_tf["M5"]:
-            analysis.m5_fvgs = self.fvg_detector.detect_fvgs(candles_by_tf["M5"], "M5")
+        if "M5" in futures:
+            analysis.m5_fvgs, analysis.m5_fvg_columns, _ = futures["M5"].result()
         
-        logger.info(f"Multi-timeframe analysis complete for {symbol}")
+        logger.info("Multi-timeframe analysis complete for %s", symbol)
         return analysis
     
+    def _analyze_timeframe(self, symbol: str, timeframe: str, candles: Candles,
+                           with_structure: bool) -> Tuple[List[FVG], FVGColumns, Optional[MarketStructure]]:
+        """Detect FVGs (with their columns), and optionally market structure, for one timeframe."""
+        fvgs, columns = self.fvg_detector.detect_fvgs_with_columns(candles, timeframe, symbol)
+        structure = self.structure_analyzer.identify_structure(candles) if with_structure else None
+        return fvgs, columns, structure
+    
     def get_htf_bias(self, h4_data: Optional[MarketStructure], h1_data: Optional[MarketStructure]) -> str:
         """
         Get higher timeframe bias from H4 and H1.
@@ -863,36 +1220,9 @@ class MultiTimeframeAnalyzer:
         h4_trend = h4_data.trend
         h1_trend = h1_data.trend
         
-        logger.info(f"HTF Bias Calculation: H4={h4_trend}, H1={h1_trend}")
-        
-        # Both timeframes agree
-        if h4_trend == "UPTREND" and h1_trend == "UPTREND":
-            logger.info("HTF Bias Decision: BULLISH (both timeframes agree on UPTREND)")
-            return "BULLISH"
-        elif h4_trend == "DOWNTREND" and h1_trend == "DOWNTREND":
-            logger.info("HTF Bias Decision: BEARISH (both timeframes agree on DOWNTREND)")
-            return "BEARISH"
-        
-        # H4 takes priority if it has a clear trend
-        if h4_trend == "UPTREND":
-            logger.info("HTF Bias Decision: BULLISH (H4 priority - H4 UPTREND)")
-            return "BULLISH"
-        elif h4_trend == "DOWNTREND":
-            logger.info("HTF Bias Decision: BEARISH (H4 priority - H4 DOWNTREND)")
-            return "BEARISH"
-        
-        # H1 fallback: if H4 is ranging but H1 has a clear trend
-        if h4_trend == "RANGING":
-            if h1_trend == "UPTREND":
-                logger.info("HTF Bias Decision: BULLISH (H1 fallback - H4 RANGING, H1 UPTREND)")
-                return "BULLISH"
-            elif h1_trend == "DOWNTREND":
-                logger.info("HTF Bias Decision: BEARISH (H1 fallback - H4 RANGING, H1 DOWNTREND)")
-                return "BEARISH"
-        
-        # Both ranging or no clear direction
-        logger.info("HTF Bias Decision: NEUTRAL (both timeframes ranging or unclear)")
-        return "NEUTRAL"
+        bias, reason = _htf_bias_decision(h4_trend, h1_trend)
+        logger.info("HTF Bias: H4=%s, H1=%s -> %s (%s)", h4_trend, h1_trend, bias, reason)
+        return bias
     
     def find_confluence_zones(self, tf_analysis: TimeframeAnalysis) -> List[ConfluenceZone]:
         """
@@ -904,25 +1234,51 @@ class MultiTimeframeAnalyzer:
         Returns:
             List of confluence zones
         """
+        confluence_zones, _ = self.find_confluence_zones_with_entries(tf_analysis)
+        return confluence_zones
+    
+    def find_confluence_zones_with_entries(self, tf_analysis: TimeframeAnalysis) -> Tuple[List[ConfluenceZone], np.ndarray]:
+        """Find confluence zones, also returning their entry prices as an array."""
         confluence_zones = []
+        entry = np.empty(0, dtype=np.float64)
+        h4_fvgs = tf_analysis.h4_fvgs
+        h1_fvgs = tf_analysis.h1_fvgs
+        
+        if h4_fvgs and h1_fvgs:
+            # Check H4 and H1 FVG alignment for every pair at once: rows are
+            # H4 FVGs, columns H1 FVGs (same rule as check_fvg_alignment)
+            h4 = tf_analysis.h4_fvg_columns
+            h1 = tf_analysis.h1_fvg_columns
+            if h4 is None:
+                h4 = fvg_columns(h4_fvgs)
+            if h1 is None:
+                h1 = fvg_columns(h1_fvgs)
+            h4_low, h4_high = h4.low, h4.high
+            h1_low, h1_high = h1.low, h1.high
+            same_direction = h4.direction[:, None] == h1.direction[None, :]
+            overlap = ~((h4_high[:, None] < h1_low[None, :]) | (h1_high[None, :] < h4_low[:, None]))
+            rows, cols = np.nonzero(same_direction & overlap)
+            
+            zone_high = np.minimum(h4_high[rows], h1_high[cols])
+            zone_low = np.maximum(h4_low[rows], h1_low[cols])
+            entry = (zone_high + zone_low) / 2
+            
+            # The pair count is known here, so build the zones in one pass
+            confluence_zones = [
+                ConfluenceZone(
+                    high=high,
+                    low=low,
+                    entry_price=entry_price,
+                    components=("H4_FVG", "H1_FVG"),
+                    confidence=0.8,
+                    direction=h4_fvgs[row].direction
+                )
+                for row, high, low, entry_price in zip(rows.tolist(), zone_high.tolist(),
+                                                       zone_low.tolist(), entry.tolist())
+            ]
         
-        # Check H4 and H1 FVG alignment
-        for h4_fvg in tf_analysis.h4_fvgs:
-            for h1_fvg in tf_analysis.h1_fvgs:
-                if self.check_fvg_alignment(h4_fvg, h1_fvg):
-                    # Create confluence zone
-                    zone = ConfluenceZone(
-                        high=min(h4_fvg.high, h1_fvg.high),
-                        low=max(h4_fvg.low, h1_fvg.low),
-                        entry_price=(min(h4_fvg.high, h1_fvg.high) + max(h4_fvg.low, h1_fvg.low)) / 2,
-                        components=["H4_FVG", "H1_FVG"],
-                        confidence=0.8,
-                        direction=h4_fvg.direction
-                    )
-                    confluence_zones.append(zone)
-        
-        logger.info(f"Found {len(confluence_zones)} confluence zones")
-        return confluence_zones
+        logger.info("Found %s confluence zones", len(confluence_zones))
+        return confluence_zones, entry
     
     def check_fvg_alignment(self, h4_fvg: FVG, h1_fvg: FVG) -> bool:
         """
@@ -936,7 +1292,7 @@ class MultiTimeframeAnalyzer:
             True if FVGs overlap
         """
         # Check if same direction
-        if h4_fvg.direction != h1_fvg.direction:
+        if h4_fvg.direction_code != h1_fvg.direction_code:
             return False
         
         # Check if price ranges overlap
@@ -983,14 +1339,26 @@ class MultiTimeframeAnalyzer:
 # PENDING ORDER MANAGER
 # ============================================================================
 
+# Pending order kind -> (MT5 order type constant name, log label, SMC setup)
+_PENDING_ORDER_TYPES = {
+    "BUY_LIMIT": ("ORDER_TYPE_BUY_LIMIT", "Buy Limit", "FVG_ENTRY"),
+    "SELL_LIMIT": ("ORDER_TYPE_SELL_LIMIT", "Sell Limit", "FVG_ENTRY"),
+    "BUY_STOP": ("ORDER_TYPE_BUY_STOP", "Buy Stop", "BOS_BREAKOUT"),
+    "SELL_STOP": ("ORDER_TYPE_SELL_STOP", "Sell Stop", "BOS_BREAKOUT"),
+}
+
+
 class PendingOrderManager:
     """Manages pending orders at SMC zones."""
     
     def __init__(self, mt5_connection=None):
         self.mt5_connection = mt5_connection
         self.pending_orders: Dict[int, PendingOrder] = {}
+        # Tracked orders per symbol, kept in step with pending_orders
+        self._per_symbol_count: Counter = Counter()
         self.max_pending_per_symbol = SMC_CONFIG["max_pending_orders_per_symbol"]
         self.expiry_hours = SMC_CONFIG["pending_order_expiry_hours"]
+        self._expiry_delta = timedelta(hours=self.expiry_hours)
         logger.info("PendingOrderManager initialized")
     
     def place_buy_limit(self, symbol: str, price: float, sl: float, tp: float, volume: float) -> Optional[int]:
@@ -1007,58 +1375,7 @@ class PendingOrderManager:
         Returns:
             Order ticket or None
         """
-        import MetaTrader5 as mt5
-        from datetime import timedelta
-        
-        if not self.mt5_connection:
-            logger.error("No MT5 connection available")
-            return None
-        
-        # Check if we can place more orders for this symbol
-        symbol_orders = [o for o in self.pending_orders.values() if o.symbol == symbol]
-        if len(symbol_orders) >= self.max_pending_per_symbol:
-            logger.warning(f"Max pending orders reached for {symbol}")
-            return None
-        
-        # Prepare order request
-        request = {
-            "action": mt5.TRADE_ACTION_PENDING,
-            "symbol": symbol,
-            "volume": volume,
-            "type": mt5.ORDER_TYPE_BUY_LIMIT,
-            "price": price,
-            "sl": sl,
-            "tp": tp,
-            "deviation": 10,
-            "magic": 234000,
-            "comment": "SMC Buy Limit",
-            "type_time": mt5.ORDER_TIME_SPECIFIED,
-            "expiration": int((datetime.now() + timedelta(hours=self.expiry_hours)).timestamp())
-        }
-        
-        # Send order
-        result = mt5.order_send(request)
-        
-        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-            # Store pending order
-            pending_order = PendingOrder(
-                ticket=result.order,
-                symbol=symbol,
-                order_type="BUY_LIMIT",
-                entry_price=price,
-                stop_loss=sl,
-                take_profit=tp,
-                volume=volume,
-                placed_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(hours=self.expiry_hours),
-                smc_setup="FVG_ENTRY"
-            )
-            self.pending_orders[result.order] = pending_order
-            logger.info(f"Buy Limit placed: {symbol} @ {price}, ticket {result.order}")
-            return result.order
-        else:
-            logger.error(f"Failed to place Buy Limit: {result.comment if result else 'No result'}")
-            return None
+        return self._place_pending("BUY_LIMIT", symbol, price, sl, tp, volume)
     
     def place_sell_limit(self, symbol: str, price: float, sl: float, tp: float, volume: float) -> Optional[int]:
         """
@@ -1074,58 +1391,7 @@ class PendingOrderManager:
         Returns:
             Order ticket or None
         """
-        import MetaTrader5 as mt5
-        from datetime import timedelta
-        
-        if not self.mt5_connection:
-            logger.error("No MT5 connection available")
-            return None
-        
-        # Check if we can place more orders for this symbol
-        symbol_orders = [o for o in self.pending_orders.values() if o.symbol == symbol]
-        if len(symbol_orders) >= self.max_pending_per_symbol:
-            logger.warning(f"Max pending orders reached for {symbol}")
-            return None
-        
-        # Prepare order request
-        request = {
-            "action": mt5.TRADE_ACTION_PENDING,
-            "symbol": symbol,
-            "volume": volume,
-            "type": mt5.ORDER_TYPE_SELL_LIMIT,
-            "price": price,
-            "sl": sl,
-            "tp": tp,
-            "deviation": 10,
-            "magic": 234000,
-            "comment": "SMC Sell Limit",
-            "type_time": mt5.ORDER_TIME_SPECIFIED,
-            "expiration": int((datetime.now() + timedelta(hours=self.expiry_hours)).timestamp())
-        }
-        
-        # Send order
-        result = mt5.order_send(request)
-        
-        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-            # Store pending order
-            pending_order = PendingOrder(
-                ticket=result.order,
-                symbol=symbol,
-                order_type="SELL_LIMIT",
-                entry_price=price,
-                stop_loss=sl,
-                take_profit=tp,
-                volume=volume,
-                placed_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(hours=self.expiry_hours),
-                smc_setup="FVG_ENTRY"
-            )
-            self.pending_orders[result.order] = pending_order
-            logger.info(f"Sell Limit placed: {symbol} @ {price}, ticket {result.order}")
-            return result.order
-        else:
-            logger.error(f"Failed to place Sell Limit: {result.comment if result else 'No result'}")
-            return None
+        return self._place_pending("SELL_LIMIT", symbol, price, sl, tp, volume)
     
     def place_buy_stop(self, symbol: str, price: float, sl: float, tp: float, volume: float) -> Optional[int]:
         """
@@ -1141,54 +1407,7 @@ class PendingOrderManager:
         Returns:
             Order ticket or None
         """
-        import MetaTrader5 as mt5
-        from datetime import timedelta
-        
-        if not self.mt5_connection:
-            logger.error("No MT5 connection available")
-            return None
-        
-        symbol_orders = [o for o in self.pending_orders.values() if o.symbol == symbol]
-        if len(symbol_orders) >= self.max_pending_per_symbol:
-            logger.warning(f"Max pending orders reached for {symbol}")
-            return None
-        
-        request = {
-            "action": mt5.TRADE_ACTION_PENDING,
-            "symbol": symbol,
-            "volume": volume,
-            "type": mt5.ORDER_TYPE_BUY_STOP,
-            "price": price,
-            "sl": sl,
-            "tp": tp,
-            "deviation": 10,
-            "magic": 234000,
-            "comment": "SMC Buy Stop",
-            "type_time": mt5.ORDER_TIME_SPECIFIED,
-            "expiration": int((datetime.now() + timedelta(hours=self.expiry_hours)).timestamp())
-        }
-        
-        result = mt5.order_send(request)
-        
-        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-            pending_order = PendingOrder(
-                ticket=result.order,
-                symbol=symbol,
-                order_type="BUY_STOP",
-                entry_price=price,
-                stop_loss=sl,
-                take_profit=tp,
-                volume=volume,
-                placed_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(hours=self.expiry_hours),
-                smc_setup="BOS_BREAKOUT"
-            )
-            self.pending_orders[result.order] = pending_order
-            logger.info(f"Buy Stop placed: {symbol} @ {price}, ticket {result.order}")
-            return result.order
-        else:
-            logger.error(f"Failed to place Buy Stop: {result.comment if result else 'No result'}")
-            return None
+        return self._place_pending("BUY_STOP", symbol, price, sl, tp, volume)
     
     def place_sell_stop(self, symbol: str, price: float, sl: float, tp: float, volume: float) -> Optional[int]:
         """
@@ -1204,53 +1423,63 @@ class PendingOrderManager:
         Returns:
             Order ticket or None
         """
-        import MetaTrader5 as mt5
-        from datetime import timedelta
+        return self._place_pending("SELL_STOP", symbol, price, sl, tp, volume)
+    
+    def _place_pending(self, order_type: str, symbol: str, price: float, sl: float,
+                       tp: float, volume: float) -> Optional[int]:
+        """Place a pending order of the given _PENDING_ORDER_TYPES kind and track it."""
+        mt5_type, label, smc_setup = _PENDING_ORDER_TYPES[order_type]
         
         if not self.mt5_connection:
             logger.error("No MT5 connection available")
             return None
         
-        symbol_orders = [o for o in self.pending_orders.values() if o.symbol == symbol]
-        if len(symbol_orders) >= self.max_pending_per_symbol:
-            logger.warning(f"Max pending orders reached for {symbol}")
+        # Check if we can place more orders for this symbol
+        if self._per_symbol_count[symbol] >= self.max_pending_per_symbol:
+            logger.warning("Max pending orders reached for %s", symbol)
             return None
         
+        now = datetime.now()
+        expires_at = now + self._expiry_delta
+        
+        # Prepare order request
         request = {
             "action": mt5.TRADE_ACTION_PENDING,
             "symbol": symbol,
             "volume": volume,
-            "type": mt5.ORDER_TYPE_SELL_STOP,
+            "type": getattr(mt5, mt5_type),
             "price": price,
             "sl": sl,
             "tp": tp,
             "deviation": 10,
             "magic": 234000,
-            "comment": "SMC Sell Stop",
+            "comment": f"SMC {label}",
             "type_time": mt5.ORDER_TIME_SPECIFIED,
-            "expiration": int((datetime.now() + timedelta(hours=self.expiry_hours)).timestamp())
+            "expiration": int(expires_at.timestamp())
         }
         
+        # Send order
         result = mt5.order_send(request)
         
         if result and result.retcode == mt5.TRADE_RETCODE_DONE:
+            # Store pending order
             pending_order = PendingOrder(
                 ticket=result.order,
                 symbol=symbol,
-                order_type="SELL_STOP",
+                order_type=order_type,
                 entry_price=price,
                 stop_loss=sl,
                 take_profit=tp,
                 volume=volume,
-                placed_at=datetime.now(),
-                expires_at=datetime.now() + timedelta(hours=self.expiry_hours),
-                smc_setup="BOS_BREAKOUT"
+                placed_at=now,
+                expires_at=expires_at,
+                smc_setup=smc_setup
             )
-            self.pending_orders[result.order] = pending_order
-            logger.info(f"Sell Stop placed: {symbol} @ {price}, ticket {result.order}")
+            self._track_order(pending_order)
+            logger.info("%s placed: %s @ %s, ticket %s", label, symbol, price, result.order)
             return result.order
         else:
-            logger.error(f"Failed to place Sell Stop: {result.comment if result else 'No result'}")
+            logger.error("Failed to place %s: %s", label, result.comment if result else 'No result')
             return None
     
     def cancel_pending_order(self, ticket: int) -> bool:
@@ -1263,8 +1492,6 @@ class PendingOrderManager:
         Returns:
             True if cancelled successfully
         """
-        import MetaTrader5 as mt5
-        
         if not self.mt5_connection:
             logger.error("No MT5 connection available")
             return False
@@ -1277,14 +1504,27 @@ class PendingOrderManager:
         result = mt5.order_send(request)
         
         if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-            if ticket in self.pending_orders:
-                del self.pending_orders[ticket]
-            logger.info(f"Cancelled pending order {ticket}")
+            self._untrack_order(ticket)
+            logger.info("Cancelled pending order %s", ticket)
             return True
         else:
-            logger.error(f"Failed to cancel order {ticket}: {result.comment if result else 'No result'}")
+            logger.error("Failed to cancel order %s: %s", ticket, result.comment if result else 'No result')
             return False
     
+    def _track_order(self, order: PendingOrder) -> None:
+        """Start tracking a placed order."""
+        self.pending_orders[order.ticket] = order
+        self._per_symbol_count[order.symbol] += 1
+    
+    def _untrack_order(self, ticket: int) -> None:
+        """Stop tracking an order, if it is tracked."""
+        order = self.pending_orders.pop(ticket, None)
+        if order is None:
+            return
+        self._per_symbol_count[order.symbol] -= 1
+        if self._per_symbol_count[order.symbol] <= 0:
+            del self._per_symbol_count[order.symbol]
+    
     def get_pending_orders(self) -> List[PendingOrder]:
         """Get list of active pending orders."""
         return list(self.pending_orders.values())
@@ -1293,33 +1533,23 @@ class PendingOrderManager:
         """
         Manage pending orders: cancel expired or invalid orders.
         """
-        import MetaTrader5 as mt5
-        
-        if not self.mt5_connection:
+        if not self.mt5_connection or not self.pending_orders:
             return
         
-        current_time = datetime.now()
-        orders_to_cancel = []
-        
-        # Check for expired orders
-        for ticket, order in self.pending_orders.items():
-            if current_time >= order.expires_at:
-                orders_to_cancel.append(ticket)
-                logger.info(f"Order {ticket} expired")
-        
-        # Cancel expired orders
-        for ticket in orders_to_cancel:
-            self.cancel_pending_order(ticket)
-        
-        # Sync with MT5 (remove filled/cancelled orders from tracking)
+        # One snapshot of live MT5 orders serves both the sync and the expiry pass
         mt5_orders = mt5.orders_get()
         mt5_tickets = {o.ticket for o in mt5_orders} if mt5_orders else set()
+        current_time = datetime.now()
         
-        for ticket in list(self.pending_orders.keys()):
+        for ticket, order in list(self.pending_orders.items()):
             if ticket not in mt5_tickets:
                 # Order no longer exists in MT5 (filled or cancelled)
-                del self.pending_orders[ticket]
-                logger.info(f"Order {ticket} removed from tracking (filled or cancelled)")
+                self._untrack_order(ticket)
+                logger.info("Order %s removed from tracking (filled or cancelled)", ticket)
+            elif current_time >= order.expires_at:
+                # Only orders still live in MT5 need a remove request
+                logger.info("Order %s expired", ticket)
+                self.cancel_pending_order(ticket)
 
 
 # ============================================================================
@@ -1331,10 +1561,15 @@ class SymbolFilter:
     
     def __init__(self, mt5_connection=None):
         self.whitelisted_symbols = SMC_CONFIG["whitelisted_symbols"]
+        self._whitelist_set = frozenset(self.whitelisted_symbols)
         self.symbol_variations = SMC_CONFIG["symbol_variations"]
         self.symbol_map: Dict[str, SymbolMapping] = {}
+        self.broker_to_standard: Dict[str, str] = {}  # Reverse of symbol_map
+        # Bumped on every symbol_map change; tags the cached tradeable list
+        self._symbol_map_version = 0
+        self._tradeable_cache: Tuple[Tuple[str, ...], int] = ((), -1)
         self.mt5_connection = mt5_connection
-        logger.info(f"SymbolFilter initialized with whitelist: {self.whitelisted_symbols}")
+        logger.info("SymbolFilter initialized with whitelist: %s", self.whitelisted_symbols)
     
     def initialize_symbol_mapping(self) -> None:
         """
@@ -1347,8 +1582,6 @@ class SymbolFilter:
             logger.warning("No MT5 connection provided for symbol mapping")
             return
         
-        import MetaTrader5 as mt5
-        
         # Get all available symbols from broker
         all_symbols = mt5.symbols_get()
         if not all_symbols:
@@ -1356,16 +1589,27 @@ class SymbolFilter:
             return
         
         broker_symbol_names = [s.name for s in all_symbols]
-        logger.info(f"Found {len(broker_symbol_names)} symbols on broker")
-        
-        # Log potential matches for debugging
-        us30_candidates = [s for s in broker_symbol_names if 'US30' in s.upper() or 'USA30' in s.upper() or 'DJ' in s.upper() or 'DOW' in s.upper()]
-        xau_candidates = [s for s in broker_symbol_names if 'XAU' in s.upper() or 'GOLD' in s.upper()]
-        nas_candidates = [s for s in broker_symbol_names if 'NAS' in s.upper() or 'NDX' in s.upper() or 'US100' in s.upper() or 'USA100' in s.upper()]
-        
-        logger.info(f"US30 candidates: {us30_candidates[:10]}")
-        logger.info(f"XAUUSD candidates: {xau_candidates[:10]}")
-        logger.info(f"NASDAQ candidates: {nas_candidates[:10]}")
+        logger.info("Found %s symbols on broker", len(broker_symbol_names))
+        
+        # Upper-case every broker symbol once; the first symbol wins on
+        # case-insensitive duplicates, as with the ordered scan
+        upper_names = [bs.upper() for bs in broker_symbol_names]
+        exact_by_upper: Dict[str, str] = {}
+        for bs, bs_upper in zip(broker_symbol_names, upper_names):
+            exact_by_upper.setdefault(bs_upper, bs)
+        # Symbols shorter than 3 characters are never partial matches
+        partial_candidates = [(bs, bs_upper) for bs, bs_upper in zip(broker_symbol_names, upper_names)
+                              if len(bs) >= 3]
+        
+        # Log potential matches for debugging (the scans only feed the log)
+        if logger.isEnabledFor(logging.INFO):
+            us30_candidates = [bs for bs, u in zip(broker_symbol_names, upper_names) if 'US30' in u or 'USA30' in u or 'DJ' in u or 'DOW' in u]
+            xau_candidates = [bs for bs, u in zip(broker_symbol_names, upper_names) if 'XAU' in u or 'GOLD' in u]
+            nas_candidates = [bs for bs, u in zip(broker_symbol_names, upper_names) if 'NAS' in u or 'NDX' in u or 'US100' in u or 'USA100' in u]
+            
+            logger.info("US30 candidates: %s", us30_candidates[:10])
+            logger.info("XAUUSD candidates: %s", xau_candidates[:10])
+            logger.info("NASDAQ candidates: %s", nas_candidates[:10])
         
         # Map each whitelisted symbol
         for standard_name in self.whitelisted_symbols:
@@ -1374,28 +1618,20 @@ class SymbolFilter:
             # Try to find matching broker symbol
             broker_symbol = None
             for variation in variations:
+                variation_upper = variation.upper()
+                
                 # Exact match (case-insensitive) - highest priority
-                for bs in broker_symbol_names:
-                    if bs.upper() == variation.upper():
-                        broker_symbol = bs
-                        break
+                broker_symbol = exact_by_upper.get(variation_upper)
                 
                 if broker_symbol:
                     break
                 
                 # Partial match (case-insensitive) - but avoid single-letter matches
-                for bs in broker_symbol_names:
-                    # Skip if broker symbol is too short (likely incorrect match)
-                    if len(bs) < 3:
-                        continue
-                    
-                    # Check if variation is contained in broker symbol
-                    if len(variation) >= 3 and variation.upper() in bs.upper():
-                        broker_symbol = bs
-                        break
-                    
-                    # Check if broker symbol is contained in variation
-                    if len(bs) >= 3 and bs.upper() in variation.upper():
+                check_contains = len(variation) >= 3
+                for bs, bs_upper in partial_candidates:
+                    # Check if variation is contained in broker symbol, or
+                    # broker symbol is contained in variation
+                    if (check_contains and variation_upper in bs_upper) or bs_upper in variation_upper:
                         broker_symbol = bs
                         break
                 
@@ -1415,11 +1651,13 @@ class SymbolFilter:
                         max_lot=symbol_info.volume_max
                     )
                     self.symbol_map[standard_name] = mapping
-                    logger.info(f"Mapped {standard_name} -> {broker_symbol}")
+                    self._symbol_map_version += 1
+                    self.broker_to_standard.setdefault(broker_symbol, standard_name)
+                    logger.info("Mapped %s -> %s", standard_name, broker_symbol)
                 else:
-                    logger.warning(f"Could not get info for {broker_symbol}")
+                    logger.warning("Could not get info for %s", broker_symbol)
             else:
-                logger.warning(f"Could not find broker symbol for {standard_name}")
+                logger.warning("Could not find broker symbol for %s", standard_name)
     
     def get_broker_symbol(self, standard_name: str) -> Optional[str]:
         """Get broker-specific symbol name from standard name."""
@@ -1428,20 +1666,16 @@ class SymbolFilter:
     
     def is_symbol_whitelisted(self, symbol: str) -> bool:
         """Check if symbol is in whitelist."""
-        # Check standard names
-        if symbol in self.whitelisted_symbols:
-            return True
-        
-        # Check broker symbols
-        for mapping in self.symbol_map.values():
-            if mapping.broker_symbol == symbol:
-                return True
-        
-        return False
+        # Check standard names, then mapped broker symbols
+        return symbol in self._whitelist_set or symbol in self.broker_to_standard
     
     def get_tradeable_symbols(self) -> List[str]:
         """Get list of available whitelisted symbols (broker names)."""
-        return [m.broker_symbol for m in self.symbol_map.values() if m.is_available]
+        symbols, version = self._tradeable_cache
+        if version != self._symbol_map_version:
+            symbols = tuple(m.broker_symbol for m in self.symbol_map.values() if m.is_available)
+            self._tradeable_cache = (symbols, self._symbol_map_version)
+        return list(symbols)
 
 
 # ============================================================================
@@ -1453,30 +1687,61 @@ class MarketHoursManager:
     
     def __init__(self):
         self.trading_sessions: Dict[str, TradingSession] = {}
+        self.session_checkers: Dict[str, Callable[[int, int], bool]] = {}
+        # Loaded sessions packed as parallel columns (see _pack_sessions)
+        self._session_symbols: List[str] = []
+        self._session_bounds = np.zeros((4, 0), dtype=np.int64)
+        self._session_day_masks = np.zeros(0, dtype=np.int64)
         logger.info("MarketHoursManager initialized")
     
     def load_trading_sessions(self) -> None:
         """Load trading session schedules from config."""
-        sessions_config = SMC_CONFIG["trading_sessions"]
-        
-        for symbol, schedule in sessions_config.items():
-            # Parse time strings
-            open_time = datetime.strptime(schedule["open"], "%H:%M").time()
-            close_time = datetime.strptime(schedule["close"], "%H:%M").time()
-            break_start = datetime.strptime(schedule["break_start"], "%H:%M").time() if schedule.get("break_start") else None
-            break_end = datetime.strptime(schedule["break_end"], "%H:%M").time() if schedule.get("break_end") else None
+        # Times are parsed once at config import
+        for symbol, schedule in TRADING_SESSION_TIMES.items():
+            open_time = schedule["open"]
+            close_time = schedule["close"]
             
             session = TradingSession(
                 symbol=symbol,
                 open_time=open_time,
                 close_time=close_time,
-                break_start=break_start,
-                break_end=break_end,
-                trading_days=[0, 1, 2, 3, 4, 6]  # Mon-Fri + Sunday
+                break_start=schedule["break_start"],
+                break_end=schedule["break_end"],
+                trading_days=(0, 1, 2, 3, 4, 6)  # Mon-Fri + Sunday
             )
             
             self.trading_sessions[symbol] = session
-            logger.info(f"Loaded session for {symbol}: {open_time} - {close_time}")
+            self.session_checkers[symbol] = SESSION_CHECKERS[symbol]
+            logger.info("Loaded session for %s: %s - %s", symbol, open_time, close_time)
+        
+        self._pack_sessions()
+    
+    def _pack_sessions(self) -> None:
+        """
+        Pack loaded sessions into arrays for checking every symbol at once.
+        
+        Bounds rows are session open, session length, break start and break
+        length, all in minutes (length 0 when there is no break). Day masks
+        have bit d set when weekday d is a trading day.
+        """
+        sessions = list(self.trading_sessions.values())
+        bounds = []
+        for session in sessions:
+            open_min = minute_of_day(session.open_time)
+            if session.break_start and session.break_end:
+                break_min = minute_of_day(session.break_start)
+                break_span = (minute_of_day(session.break_end) - break_min) % 1440
+            else:
+                break_min = break_span = 0
+            bounds.append((open_min, (minute_of_day(session.close_time) - open_min) % 1440,
+                           break_min, break_span))
+        
+        self._session_symbols = [session.symbol for session in sessions]
+        self._session_bounds = np.array(bounds, dtype=np.int64).reshape(-1, 4).T
+        self._session_day_masks = np.array(
+            [sum(1 << day for day in set(session.trading_days)) for session in sessions],
+            dtype=np.int64
+        )
     
     def is_market_open(self, symbol: str, current_time: datetime) -> bool:
         """
@@ -1491,7 +1756,7 @@ class MarketHoursManager:
         """
         session = self.trading_sessions.get(symbol)
         if not session:
-            logger.warning(f"No session schedule for {symbol}")
+            logger.warning("No session schedule for %s", symbol)
             return False
         
         # Check if current day is a trading day
@@ -1499,28 +1764,8 @@ class MarketHoursManager:
         if current_day not in session.trading_days:
             return False
         
-        current_time_only = current_time.time()
-        
-        # Handle 24-hour markets (open > close means crosses midnight)
-        if session.open_time > session.close_time:
-            # Market is open if time >= open OR time < close
-            is_open = current_time_only >= session.open_time or current_time_only < session.close_time
-        else:
-            # Normal case: open < close
-            is_open = session.open_time <= current_time_only < session.close_time
-        
-        # Check if in daily break
-        if is_open and session.break_start and session.break_end:
-            if session.break_start > session.break_end:
-                # Break crosses midnight
-                in_break = current_time_only >= session.break_start or current_time_only < session.break_end
-            else:
-                in_break = session.break_start <= current_time_only < session.break_end
-            
-            if in_break:
-                return False
-        
-        return is_open
+        # Open/close and break bounds are baked into the per-symbol checker
+        return self.session_checkers[symbol](current_time.hour, current_time.minute)
     
     def get_next_open_time(self, symbol: str) -> Optional[datetime]:
         """Calculate when market opens next for symbol."""
@@ -1530,19 +1775,80 @@ class MarketHoursManager:
     def get_tradeable_symbols_now(self) -> List[str]:
         """Get list of symbols that are currently tradeable."""
         current_time = datetime.utcnow()  # Use UTC/GMT
-        tradeable = []
+        minute = current_time.hour * 60 + current_time.minute
+        open_min, session_span, break_min, break_span = self._session_bounds
         
-        for symbol in self.trading_sessions.keys():
-            if self.is_market_open(symbol, current_time):
-                tradeable.append(symbol)
+        # Same rules as is_market_open, evaluated for every symbol at once
+        trading_day = (self._session_day_masks & (1 << current_time.weekday())) != 0
+        in_session = (minute - open_min) % 1440 < session_span
+        in_break = (minute - break_min) % 1440 < break_span
         
-        return tradeable
+        return [self._session_symbols[i]
+                for i in np.flatnonzero(trading_day & in_session & ~in_break).tolist()]
 
 
 # ============================================================================
 # SMC SIGNAL GENERATOR
 # ============================================================================
 
+# HTF bias -> trade direction
+_BIAS_TO_DIRECTION = {"BULLISH": "BUY", "BEARISH": "SELL"}
+
+# Order type by [is sell][entry reached by pullback/rally]
+_ORDER_TYPES = (("BUY_STOP", "BUY_LIMIT"), ("SELL_STOP", "SELL_LIMIT"))
+
+
+def _fvg_signal_levels(is_buy: bool, entry: float, fvg_low: float,
+                       fvg_high: float) -> Tuple[float, float]:
+    """
+    Stop loss and take profit for an FVG entry.
+    
+    The stop sits just beyond the far edge of the FVG and the target is
+    2.5x the risk from entry.
+    
+    Returns:
+        Tuple of (stop_loss, take_profit)
+    """
+    if is_buy:
+        stop_loss = fvg_low * 0.999
+        return stop_loss, entry + (entry - stop_loss) * 2.5
+    stop_loss = fvg_high * 1.001
+    return stop_loss, entry - (stop_loss - entry) * 2.5
+
+
+def _zone_signal_levels(is_buy: bool, zone_low: float, zone_high: float) -> Tuple[float, float]:
+    """
+    Stop loss and take profit for a confluence zone entry.
+    
+    The stop sits 10% of the zone height beyond the zone and the target
+    2x the zone height beyond its other edge.
+    
+    Returns:
+        Tuple of (stop_loss, take_profit)
+    """
+    height = zone_high - zone_low
+    if is_buy:
+        return zone_low - height * 0.1, zone_high + height * 2
+    return zone_high + height * 0.1, zone_low - height * 2
+
+
+@lru_cache(maxsize=4096)
+def _risk_reward(entry: float, stop_loss: float, take_profit: float) -> Tuple[float, float]:
+    """
+    Risk and reward-to-risk ratio of a setup.
+    
+    Pure in its (rounded) levels, so rescans of an unchanged setup are
+    answered from the cache.
+    
+    Returns:
+        Tuple of (risk, rr_ratio); rr_ratio is 0.0 when there is no risk
+    """
+    risk = abs(entry - stop_loss)
+    if risk <= 0:
+        return risk, 0.0
+    return risk, abs(take_profit - entry) / risk
+
+
 class SMCSignalGenerator:
     """Generates high-probability SMC trade signals."""
     
@@ -1555,7 +1861,7 @@ class SMCSignalGenerator:
         self.min_rr = SMC_CONFIG["risk_reward_min"]
         logger.info("SMCSignalGenerator initialized")
     
-    def analyze_setup(self, symbol: str, candles_by_tf: Dict[str, List[dict]], 
+    def analyze_setup(self, symbol: str, candles_by_tf: Dict[str, Candles], 
                      current_price: float) -> Optional[SMCSignal]:
         """
         Analyze complete SMC setup for a symbol.
@@ -1568,167 +1874,104 @@ class SMCSignalGenerator:
         Returns:
             SMCSignal or None
         """
+        now = datetime.now()
+        
         # Multi-timeframe analysis
         tf_analysis = self.mtf_analyzer.analyze_all_timeframes(symbol, candles_by_tf)
         
         # Get HTF bias
         htf_bias = self.mtf_analyzer.get_htf_bias(tf_analysis.h4_structure, tf_analysis.h1_structure)
         
-        logger.info(f"HTF Bias for {symbol}: {htf_bias}")
+        logger.info("HTF Bias for %s: %s", symbol, htf_bias)
         
         if htf_bias == "NEUTRAL":
-            logger.info(f"Skipping {symbol}: Neutral bias")
+            logger.info("Skipping %s: Neutral bias", symbol)
             return None
         
         # Find confluence zones
-        confluence_zones = self.mtf_analyzer.find_confluence_zones(tf_analysis)
+        confluence_zones, zone_entries = self.mtf_analyzer.find_confluence_zones_with_entries(tf_analysis)
         
         if not confluence_zones:
-            logger.info(f"No confluence zones found for {symbol}")
+            logger.info("No confluence zones found for %s", symbol)
             
             # Fallback: Use H1 FVGs if available
             if tf_analysis.h1_fvgs:
-                logger.info(f"Using H1 FVGs as fallback for {symbol}")
+                logger.info("Using H1 FVGs as fallback for %s", symbol)
+                
+                h1 = tf_analysis.h1_fvg_columns
+                if h1 is None:
+                    h1 = fvg_columns(tf_analysis.h1_fvgs)
                 
                 # Filter FVGs by direction matching bias
-                matching_fvgs = [fvg for fvg in tf_analysis.h1_fvgs 
-                                if (htf_bias == "BULLISH" and fvg.direction == "BULLISH") or
-                                   (htf_bias == "BEARISH" and fvg.direction == "BEARISH")]
+                matching = np.flatnonzero(h1.direction == _DIRECTION_CODES[htf_bias])
                 
-                if not matching_fvgs:
-                    logger.info(f"No matching FVGs for {symbol}")
+                if not len(matching):
+                    logger.info("No matching FVGs for %s", symbol)
                     return None
                 
                 # Get nearest FVG
-                nearest_fvg = min(matching_fvgs, key=lambda fvg: abs(fvg.equilibrium - current_price))
+                distances = np.abs(h1.equilibrium[matching] - current_price)
+                nearest_fvg = tf_analysis.h1_fvgs[int(matching[np.argmin(distances)])]
                 
                 # Create signal from FVG
-                if htf_bias == "BULLISH":
-                    entry_price = nearest_fvg.equilibrium
-                    stop_loss = nearest_fvg.low * 0.999
-                    risk = entry_price - stop_loss
-                    take_profit = entry_price + (risk * 2.5)
-                    
-                    order_type = "BUY_LIMIT" if current_price > entry_price else "BUY_STOP"
-                    
-                    signal = SMCSignal(
-                        symbol=symbol,
-                        direction="BUY",
-                        order_type=order_type,
-                        entry_price=entry_price,
-                        stop_loss=stop_loss,
-                        take_profit=take_profit,
-                        confidence=0.6,
-                        setup_type="FVG_ENTRY",
-                        timeframe_bias={"H4": tf_analysis.h4_bias, "H1": tf_analysis.h1_bias},
-                        zones=[],
-                        timestamp=datetime.now()
-                    )
-                    
-                    if self.validate_signal(signal):
-                        logger.info(f"Generated BUY signal for {symbol} from FVG")
-                        return signal
+                direction = _BIAS_TO_DIRECTION[htf_bias]
+                entry_price = nearest_fvg.equilibrium
+                stop_loss, take_profit = _fvg_signal_levels(
+                    direction == "BUY", entry_price, nearest_fvg.low, nearest_fvg.high
+                )
+                signal = self._build_signal(symbol, direction, entry_price, stop_loss, take_profit,
+                                            current_price, 0.6, "FVG_ENTRY", [], tf_analysis, now)
                 
-                else:  # BEARISH
-                    entry_price = nearest_fvg.equilibrium
-                    stop_loss = nearest_fvg.high * 1.001
-                    risk = stop_loss - entry_price
-                    take_profit = entry_price - (risk * 2.5)
-                    
-                    order_type = "SELL_LIMIT" if current_price < entry_price else "SELL_STOP"
-                    
-                    signal = SMCSignal(
-                        symbol=symbol,
-                        direction="SELL",
-                        order_type=order_type,
-                        entry_price=entry_price,
-                        stop_loss=stop_loss,
-                        take_profit=take_profit,
-                        confidence=0.6,
-                        setup_type="FVG_ENTRY",
-                        timeframe_bias={"H4": tf_analysis.h4_bias, "H1": tf_analysis.h1_bias},
-                        zones=[],
-                        timestamp=datetime.now()
-                    )
-                    
-                    if self.validate_signal(signal):
-                        logger.info(f"Generated SELL signal for {symbol} from FVG")
-                        return signal
+                if self.validate_signal(signal):
+                    logger.info("Generated %s signal for %s from FVG", direction, symbol)
+                    return signal
             
             return None
         
         # Get nearest confluence zone
-        nearest_zone = min(confluence_zones, key=lambda z: abs(z.entry_price - current_price))
+        nearest_zone = confluence_zones[int(np.argmin(np.abs(zone_entries - current_price)))]
         
-        logger.info(f"Nearest confluence zone for {symbol}: {nearest_zone.direction} @ {nearest_zone.entry_price:.2f}")
+        logger.info("Nearest confluence zone for %s: %s @ %.2f", symbol, nearest_zone.direction, nearest_zone.entry_price)
         
-        # Determine if we should enter
-        if htf_bias == "BULLISH" and nearest_zone.direction == "BULLISH":
-            # Look for buy setup
-            entry_price = nearest_zone.entry_price
-            stop_loss = nearest_zone.low - (nearest_zone.high - nearest_zone.low) * 0.1
-            take_profit = nearest_zone.high + (nearest_zone.high - nearest_zone.low) * 2
-            
-            # Determine order type
-            if current_price > entry_price:
-                order_type = "BUY_LIMIT"  # Price needs to pull back
-            else:
-                order_type = "BUY_STOP"  # Price needs to break up
-            
-            signal = SMCSignal(
-                symbol=symbol,
-                direction="BUY",
-                order_type=order_type,
-                entry_price=entry_price,
-                stop_loss=stop_loss,
-                take_profit=take_profit,
-                confidence=nearest_zone.confidence,
-                setup_type="CONFLUENCE",
-                timeframe_bias={"H4": tf_analysis.h4_bias, "H1": tf_analysis.h1_bias},
-                zones=[nearest_zone],
-                timestamp=datetime.now()
-            )
-            
-            if self.validate_signal(signal):
-                logger.info(f"Generated BUY signal for {symbol} from confluence")
-                return signal
-            else:
-                logger.info(f"Signal validation failed for {symbol}")
+        # Only enter when the zone agrees with the HTF bias
+        if nearest_zone.direction != htf_bias:
+            return None
         
-        elif htf_bias == "BEARISH" and nearest_zone.direction == "BEARISH":
-            # Look for sell setup
-            entry_price = nearest_zone.entry_price
-            stop_loss = nearest_zone.high + (nearest_zone.high - nearest_zone.low) * 0.1
-            take_profit = nearest_zone.low - (nearest_zone.high - nearest_zone.low) * 2
-            
-            # Determine order type
-            if current_price < entry_price:
-                order_type = "SELL_LIMIT"  # Price needs to rally
-            else:
-                order_type = "SELL_STOP"  # Price needs to break down
-            
-            signal = SMCSignal(
-                symbol=symbol,
-                direction="SELL",
-                order_type=order_type,
-                entry_price=entry_price,
-                stop_loss=stop_loss,
-                take_profit=take_profit,
-                confidence=nearest_zone.confidence,
-                setup_type="CONFLUENCE",
-                timeframe_bias={"H4": tf_analysis.h4_bias, "H1": tf_analysis.h1_bias},
-                zones=[nearest_zone],
-                timestamp=datetime.now()
-            )
-            
-            if self.validate_signal(signal):
-                logger.info(f"Generated SELL signal for {symbol} from confluence")
-                return signal
-            else:
-                logger.info(f"Signal validation failed for {symbol}")
+        direction = _BIAS_TO_DIRECTION[htf_bias]
+        entry_price = nearest_zone.entry_price
+        stop_loss, take_profit = _zone_signal_levels(
+            direction == "BUY", nearest_zone.low, nearest_zone.high
+        )
+        signal = self._build_signal(symbol, direction, entry_price, stop_loss, take_profit,
+                                    current_price, nearest_zone.confidence, "CONFLUENCE",
+                                    [nearest_zone], tf_analysis, now)
         
+        if self.validate_signal(signal):
+            logger.info("Generated %s signal for %s from confluence", direction, symbol)
+            return signal
+        
+        logger.info("Signal validation failed for %s", symbol)
         return None
     
+    def _build_signal(self, symbol: str, direction: str, entry_price: float, stop_loss: float,
+                      take_profit: float, current_price: float, confidence: float,
+                      setup_type: str, zones: List[ConfluenceZone],
+                      tf_analysis: TimeframeAnalysis, now: datetime) -> SMCSignal:
+        """Assemble an SMCSignal for a setup, choosing the pending order type."""
+        return SMCSignal(
+            symbol=symbol,
+            direction=direction,
+            order_type=self.get_order_type(direction, current_price, entry_price),
+            entry_price=entry_price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            confidence=confidence,
+            setup_type=setup_type,
+            timeframe_bias={"H4": tf_analysis.h4_bias, "H1": tf_analysis.h1_bias},
+            zones=zones,
+            timestamp=now
+        )
+    
     def calculate_entry_price(self, fvg: FVG, order_block: Optional[OrderBlock] = None) -> float:
         """Calculate entry price from FVG and/or Order Block."""
         if order_block:
@@ -1740,19 +1983,15 @@ class SMCSignalGenerator:
     
     def calculate_stop_loss(self, direction: str, order_block: Optional[OrderBlock] = None,
                            fvg: Optional[FVG] = None) -> float:
-        """Calculate stop loss beyond invalidation point."""
-        if direction == "BUY":
-            if order_block:
-                return order_block.low * 0.999  # Just below OB low
-            elif fvg:
-                return fvg.low * 0.999  # Just below FVG low
-        else:  # SELL
-            if order_block:
-                return order_block.high * 1.001  # Just above OB high
-            elif fvg:
-                return fvg.high * 1.001  # Just above FVG high
+        """Calculate stop loss beyond invalidation point (the OB if given, else the FVG)."""
+        zone = order_block if order_block is not None else fvg
+        if zone is None:
+            raise ValueError("calculate_stop_loss needs an order block or an FVG")
         
-        return 0.0
+        # Just below the low for buys, just above the high for sells
+        if direction == "BUY":
+            return zone.low * 0.999
+        return zone.high * 1.001
     
     def calculate_take_profit(self, direction: str, entry: float, stop_loss: float,
                              rr_ratio: float = 2.0) -> float:
@@ -1767,15 +2006,10 @@ class SMCSignalGenerator:
     def get_order_type(self, direction: str, current_price: float, entry_price: float) -> str:
         """Determine order type based on price position."""
         if direction == "BUY":
-            if current_price > entry_price:
-                return "BUY_LIMIT"  # Buy on pullback
-            else:
-                return "BUY_STOP"  # Buy on breakout
-        else:  # SELL
-            if current_price < entry_price:
-                return "SELL_LIMIT"  # Sell on rally
-            else:
-                return "SELL_STOP"  # Sell on breakdown
+            # Buy on pullback (limit) when price is above entry, else on breakout
+            return _ORDER_TYPES[0][current_price > entry_price]
+        # Sell on rally (limit) when price is below entry, else on breakdown
+        return _ORDER_TYPES[1][current_price < entry_price]
     
     def validate_signal(self, signal: SMCSignal) -> bool:
         """
@@ -1787,33 +2021,35 @@ class SMCSignalGenerator:
         Returns:
             True if valid
         """
+        # Cheapest and most frequent rejections first
+        
+        # Check confidence
+        if signal.confidence < 0.5:
+            logger.info("Signal rejected: Low confidence %s", signal.confidence)
+            return False
+        
         # Check all required fields are populated
         if not signal.entry_price or not signal.stop_loss or not signal.take_profit:
-            logger.warning(f"Signal rejected: Missing required fields (entry={signal.entry_price}, sl={signal.stop_loss}, tp={signal.take_profit})")
+            logger.warning("Signal rejected: Missing required fields (entry=%s, sl=%s, tp=%s)",
+                           signal.entry_price, signal.stop_loss, signal.take_profit)
             return False
         
-        # Check risk-reward ratio
-        risk = abs(signal.entry_price - signal.stop_loss)
-        reward = abs(signal.take_profit - signal.entry_price)
+        # Check risk-reward ratio; levels are rounded to 5 decimals so an
+        # unchanged setup hits the cache on every rescan
+        risk, rr_ratio = _risk_reward(round(signal.entry_price, 5), round(signal.stop_loss, 5),
+                                      round(signal.take_profit, 5))
         
         if risk <= 0:
-            logger.warning(f"Signal rejected: Invalid risk {risk}")
+            logger.warning("Signal rejected: Invalid risk %s", risk)
             return False
         
-        rr_ratio = reward / risk
-        
-        logger.info(f"Signal validation: RR={rr_ratio:.2f}, Confidence={signal.confidence:.2%}")
+        logger.info("Signal validation: RR=%.2f, Confidence=%.2f%%", rr_ratio, signal.confidence * 100)
         
         if rr_ratio < self.min_rr:
-            logger.info(f"Signal rejected: RR {rr_ratio:.2f} < minimum {self.min_rr}")
-            return False
-        
-        # Check confidence
-        if signal.confidence < 0.5:
-            logger.info(f"Signal rejected: Low confidence {signal.confidence}")
+            logger.info("Signal rejected: RR %.2f < minimum %s", rr_ratio, self.min_rr)
             return False
         
-        logger.info(f"Signal validated: {signal.symbol} {signal.direction} @ {signal.entry_price:.2f}")
+        logger.info("Signal validated: %s %s @ %.2f", signal.symbol, signal.direction, signal.entry_price)
         return True
 
 
@@ -1821,6 +2057,11 @@ class SMCSignalGenerator:
 # MAIN SMC STRATEGY CLASS
 # ============================================================================
 
+# Seconds a computed tradeable-symbol list stays valid; sessions change on
+# minute boundaries so a short TTL is safe
+_TRADEABLE_SYMBOLS_TTL = 30.0
+
+
 class SMCStrategy:
     """Main Smart Money Concepts strategy coordinator."""
     
@@ -1842,6 +2083,9 @@ class SMCStrategy:
         self.pending_order_manager = PendingOrderManager(mt5_connection)
         self.symbol_filter = SymbolFilter(mt5_connection)
         self.market_hours_manager = MarketHoursManager()
+        self._tradeable_symbols: Tuple[float, List[str]] = (float("-inf"), [])
+        # Symbols are independent, so multi-symbol analysis runs concurrently
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="smc-sym")
         
         # Initialize components
         self.symbol_filter.initialize_symbol_mapping()
@@ -1849,27 +2093,36 @@ class SMCStrategy:
         
         logger.info("SMCStrategy initialized")
     
+    def refresh_symbols(self) -> None:
+        """Drop the cached tradeable-symbol list so the next call recomputes it."""
+        self._tradeable_symbols = (float("-inf"), [])
+    
     def get_tradeable_symbols(self) -> List[str]:
-        """Get symbols that are both whitelisted and market is open."""
+        """Get symbols that are both whitelisted and market is open.
+        
+        The result is cached for ``_TRADEABLE_SYMBOLS_TTL`` seconds; call
+        ``refresh_symbols()`` to force a recompute.
+        """
+        now = monotonic()
+        computed_at, cached = self._tradeable_symbols
+        if now - computed_at < _TRADEABLE_SYMBOLS_TTL:
+            return list(cached)
+        
         available_symbols = self.symbol_filter.get_tradeable_symbols()
-        open_standard_symbols = self.market_hours_manager.get_tradeable_symbols_now()
+        open_set = frozenset(self.market_hours_manager.get_tradeable_symbols_now())
         
         # Filter available symbols by market hours
-        # available_symbols contains broker symbols, open_standard_symbols contains standard names
-        tradeable = []
-        for broker_symbol in available_symbols:
-            # Find the standard name for this broker symbol
-            for standard_name, mapping in self.symbol_filter.symbol_map.items():
-                if mapping.broker_symbol == broker_symbol:
-                    # Check if this standard symbol's market is open
-                    if standard_name in open_standard_symbols:
-                        tradeable.append(broker_symbol)
-                    break
+        # available_symbols contains broker symbols, open_set contains standard names;
+        # each symbol costs one reverse-map lookup plus one set probe
+        broker_to_standard = self.symbol_filter.broker_to_standard
+        tradeable = [broker_symbol for broker_symbol in available_symbols
+                     if broker_to_standard.get(broker_symbol) in open_set]
         
-        logger.info(f"Tradeable symbols: {tradeable}")
-        return tradeable
+        self._tradeable_symbols = (now, tradeable)
+        logger.info("Tradeable symbols: %s", tradeable)
+        return list(tradeable)
     
-    def analyze_symbol(self, symbol: str, candles: List[dict], timeframe: str = "H1") -> Dict:
+    def analyze_symbol(self, symbol: str, candles: Candles, timeframe: str = "H1") -> Dict:
         """
         Perform complete SMC analysis on a symbol.
         
@@ -1882,7 +2135,7 @@ class SMCStrategy:
             Dictionary with analysis results
         """
         # Detect FVGs
-        fvgs = self.fvg_detector.detect_fvgs(candles, timeframe)
+        fvgs = self.fvg_detector.detect_fvgs(candles, timeframe, symbol)
         valid_fvgs = self.fvg_detector.filter_valid_fvgs(fvgs)
         
         # Detect Order Blocks
@@ -1909,6 +2162,30 @@ class SMCStrategy:
         
         return analysis
     
+    def analyze_symbols(self, candles_by_symbol: Dict[str, Candles],
+                        timeframe: str = "H1") -> Dict[str, Dict]:
+        """
+        Perform complete SMC analysis on several symbols.
+        
+        FVGs for all symbols are detected in one batched pass first; the
+        per-symbol analyses then run on a thread pool and reuse them from
+        the detector's memo.
+        
+        Args:
+            candles_by_symbol: OHLC candles for each symbol
+            timeframe: Timeframe string
+            
+        Returns:
+            Dictionary mapping symbol to its analysis results
+        """
+        self.fvg_detector.detect_fvgs_batch(candles_by_symbol, timeframe)
+        symbols = list(candles_by_symbol)
+        analyses = self._executor.map(
+            lambda symbol: self.analyze_symbol(symbol, candles_by_symbol[symbol], timeframe),
+            symbols
+        )
+        return dict(zip(symbols, analyses))
+    
     def log_analysis(self, analysis: Dict) -> None:
         """
         Log SMC analysis results.
@@ -1916,31 +2193,36 @@ class SMCStrategy:
         Args:
             analysis: Analysis dictionary
         """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
         symbol = analysis["symbol"]
         timeframe = analysis["timeframe"]
         
-        logger.info(f"=== SMC Analysis: {symbol} ({timeframe}) ===")
+        logger.info("=== SMC Analysis: %s (%s) ===", symbol, timeframe)
         
-        # Log FVGs
+        # Log FVGs (first 3) as one record; INFO is known to be enabled here
         fvgs = analysis["fvgs"]
-        logger.info(f"FVGs detected: {len(fvgs)}")
-        for i, fvg in enumerate(fvgs[:3]):  # Log first 3
-            logger.info(f"  FVG {i+1}: {fvg.direction} [{fvg.low:.2f} - {fvg.high:.2f}] EQ: {fvg.equilibrium:.2f}")
+        lines = [f"FVGs detected: {len(fvgs)}"]
+        lines.extend(f"  FVG {i}: {fvg.direction} [{fvg.low:.2f} - {fvg.high:.2f}] EQ: {fvg.equilibrium:.2f}"
+                     for i, fvg in enumerate(fvgs[:3], 1))
+        logger.info("%s", "\n".join(lines))
         
-        # Log Order Blocks
+        # Log Order Blocks (first 3) as one record
         obs = analysis["order_blocks"]
-        logger.info(f"Order Blocks detected: {len(obs)}")
-        for i, ob in enumerate(obs[:3]):  # Log first 3
-            logger.info(f"  OB {i+1}: {ob.direction} [{ob.low:.2f} - {ob.high:.2f}] Entry: {ob.entry_price:.2f}")
+        lines = [f"Order Blocks detected: {len(obs)}"]
+        lines.extend(f"  OB {i}: {ob.direction} [{ob.low:.2f} - {ob.high:.2f}] Entry: {ob.entry_price:.2f}"
+                     for i, ob in enumerate(obs[:3], 1))
+        logger.info("%s", "\n".join(lines))
         
         # Log Market Structure
         structure = analysis["market_structure"]
-        logger.info(f"Market Structure: {structure.trend}")
-        logger.info(f"  Swing Highs: {len(structure.swing_highs)}, Swing Lows: {len(structure.swing_lows)}")
+        logger.info("Market Structure: %s", structure.trend)
+        logger.info("  Swing Highs: %s, Swing Lows: %s", len(structure.swing_highs), len(structure.swing_lows))
         
         # Log Liquidity Levels
         liq_levels = analysis["liquidity_levels"]
-        logger.info(f"Liquidity Levels: {len(liq_levels)}")
+        logger.info("Liquidity Levels: %s", len(liq_levels))
     
     def log_signal(self, signal: SMCSignal) -> None:
         """
@@ -1949,16 +2231,16 @@ class SMCStrategy:
         Args:
             signal: SMC signal
         """
-        logger.info(f"=== SMC Signal Generated ===")
-        logger.info(f"Symbol: {signal.symbol}")
-        logger.info(f"Direction: {signal.direction} ({signal.order_type})")
-        logger.info(f"Entry: {signal.entry_price:.2f}")
-        logger.info(f"Stop Loss: {signal.stop_loss:.2f}")
-        logger.info(f"Take Profit: {signal.take_profit:.2f}")
-        logger.info(f"Confidence: {signal.confidence:.2%}")
-        logger.info(f"Setup Type: {signal.setup_type}")
-        logger.info(f"Timeframe Bias: {signal.timeframe_bias}")
-        logger.info(f"Confluence Zones: {len(signal.zones)}")
+        logger.info("=== SMC Signal Generated ===")
+        logger.info("Symbol: %s", signal.symbol)
+        logger.info("Direction: %s (%s)", signal.direction, signal.order_type)
+        logger.info("Entry: %.2f", signal.entry_price)
+        logger.info("Stop Loss: %.2f", signal.stop_loss)
+        logger.info("Take Profit: %.2f", signal.take_profit)
+        logger.info("Confidence: %.2f%%", signal.confidence * 100)
+        logger.info("Setup Type: %s", signal.setup_type)
+        logger.info("Timeframe Bias: %s", signal.timeframe_bias)
+        logger.info("Confluence Zones: %s", len(signal.zones))
     
     def display_status(self, symbol: str, analysis: Dict) -> str:
         """
@@ -1978,24 +2260,30 @@ class SMCStrategy:
         # Determine bias
         bias = "BULLISH" if structure.trend == "UPTREND" else "BEARISH" if structure.trend == "DOWNTREND" else "NEUTRAL"
         
-        status = f"\n📊 SMC Status: {symbol}\n"
-        status += f"{'='*50}\n"
-        status += f"Bias: {bias} ({structure.trend})\n"
-        status += f"\nActive Zones:\n"
-        status += f"  • FVGs: {len(fvgs)}\n"
-        status += f"  • Order Blocks: {len(obs)}\n"
+        # Collect the lines and join once instead of re-copying a growing string
+        lines = [
+            "",
+            f"📊 SMC Status: {symbol}",
+            "=" * 50,
+            f"Bias: {bias} ({structure.trend})",
+            "",
+            "Active Zones:",
+            f"  • FVGs: {len(fvgs)}",
+            f"  • Order Blocks: {len(obs)}",
+        ]
         
         if fvgs:
-            status += f"\nNearest FVGs:\n"
-            for i, fvg in enumerate(fvgs[:2]):
-                status += f"  {i+1}. {fvg.direction} FVG: {fvg.low:.2f} - {fvg.high:.2f}\n"
+            lines.append("\nNearest FVGs:")
+            lines.extend(f"  {i}. {fvg.direction} FVG: {fvg.low:.2f} - {fvg.high:.2f}"
+                         for i, fvg in enumerate(fvgs[:2], 1))
         
         if obs:
-            status += f"\nNearest Order Blocks:\n"
-            for i, ob in enumerate(obs[:2]):
-                status += f"  {i+1}. {ob.direction} OB: {ob.low:.2f} - {ob.high:.2f}\n"
+            lines.append("\nNearest Order Blocks:")
+            lines.extend(f"  {i}. {ob.direction} OB: {ob.low:.2f} - {ob.high:.2f}"
+                         for i, ob in enumerate(obs[:2], 1))
         
-        return status
+        lines.append("")
+        return "\n".join(lines)
     
     def log_trade_execution(self, signal: SMCSignal, ticket: Optional[int]) -> None:
         """
@@ -2006,10 +2294,10 @@ class SMCStrategy:
             ticket: Order ticket (None if failed)
         """
         if ticket:
-            logger.info(f"Trade Executed: {signal.symbol} {signal.direction}")
-            logger.info(f"   Ticket: {ticket}")
-            logger.info(f"   Setup: {signal.setup_type}")
-            logger.info(f"   Entry: {signal.entry_price:.2f}")
+            logger.info("Trade Executed: %s %s", signal.symbol, signal.direction)
+            logger.info("   Ticket: %s", ticket)
+            logger.info("   Setup: %s", signal.setup_type)
+            logger.info("   Entry: %.2f", signal.entry_price)
         else:
-            logger.error(f"Trade Failed: {signal.symbol} {signal.direction}")
-            logger.error(f"   Setup: {signal.setup_type}")
+            logger.error("Trade Failed: %s %s", signal.symbol, signal.direction)
+            logger.error("   Setup: %s", signal.setup_type)
@@ -1,9 +1,107 @@
 """Trade Manager for executing and monitoring trades."""
 
+import logging
+import random
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
 import MetaTrader5 as mt5
-from typing import List, Optional, Dict
-from datetime import datetime
+from typing import Any, List, Optional, Dict, Tuple
+from datetime import datetime, timedelta
 from src.models import Signal, Position, TradeResult
+from src.logger import logger
+
+
+# Retry pacing for order_send: exponential backoff with up to 50% jitter
+_RETRY_BASE_DELAY = 0.1
+_RETRY_JITTER = 0.5
+_RETRY_MAX_DELAY = 2.0
+
+# Failures that resending the same request cannot fix
+_UNRECOVERABLE_RETCODES = {
+    10013: "Invalid request",
+    10014: "Invalid volume",
+    10016: "Invalid stops",
+    10017: "Trading disabled",
+    10018: "Market is closed",
+    10019: "Not enough money",
+}
+
+# Rejections of the quoted price (requote, price changed, price off); only a
+# fresh price can succeed
+_REQUOTE_RETCODES = frozenset({10004, 10020, 10021})
+
+# last_error() codes that stop retries when order_send returns no result
+_UNRECOVERABLE_SEND_ERRORS = {
+    10013: "Invalid request",
+    10018: "Market is closed",
+    10019: "No prices available",
+}
+
+# Retcodes that mean the terminal cannot reach the broker (timeout, no connection)
+_OUTAGE_RETCODES = frozenset({10012, 10031})
+
+# Circuit breaker: this many outage failures within the window stop all sends for the cooldown
+_CIRCUIT_FAILURES = 5
+_CIRCUIT_WINDOW = 30.0
+_CIRCUIT_COOLDOWN = 15.0
+
+# ASCII bytes stripped from order comments: everything but letters, digits, '_', '-' and ' '
+_COMMENT_DROP = bytes(b for b in range(128) if not (chr(b).isalnum() or chr(b) in "_- "))
+
+# Upper bound on symbols flattened concurrently by close_all_positions
+_MAX_CLOSE_WORKERS = 8
+
+# Closing deals kept per ticket; oldest are evicted first
+_CLOSE_DEAL_CACHE_SIZE = 256
+
+
+# Filling modes in order of preference: (symbol filling_mode bit, MT5 order filling constant name).
+# Names are resolved on use so the table does not pin MT5 constants at import time.
+_FILLING_PREFS = (
+    (1, "ORDER_FILLING_FOK"),  # SYMBOL_FILLING_FOK (Fill or Kill)
+    (2, "ORDER_FILLING_IOC"),  # SYMBOL_FILLING_IOC (Immediate or Cancel)
+)
+
+
+def _resolve_filling(filling_mode: int) -> int:
+    """Map a symbol's supported filling_mode bits to the preferred order filling mode."""
+    name = next((name for mask, name in _FILLING_PREFS if filling_mode & mask), "ORDER_FILLING_RETURN")
+    return getattr(mt5, name)
+
+
+@lru_cache(maxsize=32)
+def _step_digits(step: float) -> int:
+    """Decimal places needed to express multiples of a volume step (0.01 -> 2, 0.25 -> 2)."""
+    return max(0, -Decimal(str(step)).normalize().as_tuple().exponent)
+
+
+def _normalize_volume(size: float, step: float) -> float:
+    """
+    Snap a volume to the nearest multiple of the broker's volume step.
+    
+    Rounds to whole steps, then to the step's decimal places so the result
+    carries no float residue (0.30000000000000004) the broker would reject.
+    """
+    steps = round(size / step)
+    return round(steps * step, _step_digits(step))
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Seconds to wait after failed attempt number `attempt` (0-based)."""
+    delay = _RETRY_BASE_DELAY * 2 ** attempt * (1 + random.uniform(0, _RETRY_JITTER))
+    return min(delay, _RETRY_MAX_DELAY)
+
+
+@dataclass(slots=True)
+class _SymbolStreak:
+    """Progressive sizing state for one symbol."""
+    multiplier: float = 1.0
+    wins: int = 0  # consecutive wins
+    losses: int = 0  # consecutive losses
 
 
 class TradeManager:
@@ -17,14 +115,30 @@ class TradeManager:
         self._progressive_sizing_enabled = False
         
         # Per-symbol progressive sizing tracking
-        self._symbol_multipliers: Dict[str, float] = {}  # Track multiplier per symbol
-        self._symbol_wins: Dict[str, int] = {}  # Track consecutive wins per symbol
-        self._symbol_losses: Dict[str, int] = {}  # Track consecutive losses per symbol
+        self._symbol_streaks: Dict[str, _SymbolStreak] = defaultdict(_SymbolStreak)  # Multiplier and win/loss streak per symbol
         
         # Global tracking (for display purposes)
         self._consecutive_wins = 0
         self._consecutive_losses = 0
         self._max_multiplier = None  # No cap - grows based on equity
+        
+        # Symbol metadata rarely changes; cache it to save terminal round-trips
+        self._symbol_info_cache: Dict[str, Tuple[float, Any]] = {}  # symbol -> (fetched at, info)
+        self._symbol_info_ttl = 60.0
+        self._type_filling: Dict[str, int] = {}  # symbol -> chosen ORDER_FILLING_* mode
+        self._request_templates: Dict[Tuple[str, int], Dict] = {}  # (symbol, filling) -> static order fields
+        self._sltp_templates: Dict[Tuple[str, int], Dict] = {}  # (symbol, filling) -> static SL/TP fields
+        
+        # Free margin only moves when orders fill; share one account snapshot across a signal burst
+        self._account_info_cache: Tuple[float, Any] = (float("-inf"), None)  # (fetched at, info)
+        self._account_info_ttl = 0.5
+        
+        # Circuit breaker state shared by every order path
+        self._failure_times: deque = deque(maxlen=_CIRCUIT_FAILURES)  # monotonic times of recent outage failures
+        self._circuit_open_until = 0.0
+        
+        # Closing deals already fetched from history, so a ticket is looked up once
+        self._close_deals: OrderedDict = OrderedDict()  # ticket -> closing deal
     
     def set_max_positions(self, max_positions: int) -> None:
         """Set maximum number of open positions allowed."""
@@ -60,14 +174,9 @@ class TradeManager:
         if not self._progressive_sizing_enabled:
             return calculated_lot
         
-        # Initialize symbol tracking if not exists
-        if symbol not in self._symbol_multipliers:
-            self._symbol_multipliers[symbol] = 1.0
-            self._symbol_wins[symbol] = 0
-            self._symbol_losses[symbol] = 0
-        
         # Get symbol-specific multiplier
-        progressive_lot = self._base_lot_size * self._symbol_multipliers[symbol]
+        streak = self._symbol_streaks[symbol]
+        progressive_lot = self._base_lot_size * streak.multiplier
         return progressive_lot
     
     def _update_progressive_multiplier(self, symbol: str, won: bool) -> None:
@@ -75,33 +184,78 @@ class TradeManager:
         if not self._progressive_sizing_enabled:
             return
         
-        # Initialize symbol tracking if not exists
-        if symbol not in self._symbol_multipliers:
-            self._symbol_multipliers[symbol] = 1.0
-            self._symbol_wins[symbol] = 0
-            self._symbol_losses[symbol] = 0
+        streak = self._symbol_streaks[symbol]
         
         if won:
             # Update symbol-specific tracking
-            self._symbol_wins[symbol] += 1
-            self._symbol_losses[symbol] = 0
+            streak.wins += 1
+            streak.losses = 0
             # Double the multiplier after each win (no cap - grows with equity)
-            self._symbol_multipliers[symbol] = self._symbol_multipliers[symbol] * 2.0
+            streak.multiplier *= 2.0
             
             # Update global tracking
             self._consecutive_wins += 1
             self._consecutive_losses = 0
         else:
             # Update symbol-specific tracking
-            self._symbol_losses[symbol] += 1
-            self._symbol_wins[symbol] = 0
+            streak.losses += 1
+            streak.wins = 0
             # Reset to base after loss
-            self._symbol_multipliers[symbol] = 1.0
+            streak.multiplier = 1.0
             
             # Update global tracking
             self._consecutive_losses += 1
             self._consecutive_wins = 0
     
+    def _get_symbol_info(self, symbol: str, refresh: bool = False):
+        """
+        Get symbol info, reusing a cached copy younger than the TTL.
+        
+        Args:
+            symbol: Trading symbol
+            refresh: Bypass the cache and fetch from MT5
+            
+        Returns:
+            MT5 symbol info, or None if unavailable
+        """
+        now = time.monotonic()
+        cached = self._symbol_info_cache.get(symbol)
+        if not refresh and cached is not None and now - cached[0] < self._symbol_info_ttl:
+            return cached[1]
+        
+        symbol_info = mt5.symbol_info(symbol)
+        if symbol_info is not None:
+            self._symbol_info_cache[symbol] = (now, symbol_info)
+        return symbol_info
+    
+    def _get_account_info(self):
+        """Get account info, reusing a snapshot younger than the TTL."""
+        now = time.monotonic()
+        fetched_at, account_info = self._account_info_cache
+        if account_info is not None and now - fetched_at < self._account_info_ttl:
+            return account_info
+        
+        account_info = mt5.account_info()
+        if account_info is not None:
+            self._account_info_cache = (now, account_info)
+        return account_info
+    
+    def _get_type_filling(self, symbol: str, symbol_info) -> int:
+        """Pick the order filling mode for a symbol (FOK, then IOC, then Return)."""
+        if symbol_info is None:
+            return mt5.ORDER_FILLING_RETURN
+        
+        type_filling = self._type_filling.get(symbol)
+        if type_filling is None:
+            type_filling = _resolve_filling(symbol_info.filling_mode)
+            self._type_filling[symbol] = type_filling
+        return type_filling
+    
+    def _forget_symbol(self, symbol: str) -> None:
+        """Drop a symbol's cached info and filling mode so the next order refetches them."""
+        self._symbol_info_cache.pop(symbol, None)
+        self._type_filling.pop(symbol, None)
+    
     def get_position_count(self) -> int:
         """Get current number of open positions."""
         return len(self._positions)
@@ -122,75 +276,71 @@ class TradeManager:
         Returns:
             Position object if successful, None otherwise
         """
-        from src.logger import logger
-        
         # Check if we can open new position
         if not self.can_open_new_position():
             msg = f"Cannot open position: Maximum positions ({self._max_positions}) reached"
-            print(msg)
             logger.warning(msg)
             return None
         
+        if self._circuit_open():
+            return None
+        
         # Apply progressive sizing if enabled (per symbol) - unless pyramiding
         if not skip_progressive:
             size = self.get_progressive_lot_size(signal.symbol, size)
         
-        # Validate order parameters
+        # Validate order parameters before any MT5 round-trip
         if size <= 0:
             msg = "Invalid position size"
-            print(msg)
             logger.error(msg)
             return None
         
+        if signal.direction not in ("BUY", "SELL"):
+            logger.error(f"Invalid signal direction for {signal.symbol}: {signal.direction}")
+            return None
+        
         # Get symbol info for validation
-        symbol_info = mt5.symbol_info(signal.symbol)
+        symbol_info = self._get_symbol_info(signal.symbol)
         if symbol_info is None:
             msg = f"Failed to get symbol info for {signal.symbol}"
-            print(msg)
             logger.error(msg)
             return None
         
         # Check if symbol is visible and tradeable
         if not symbol_info.visible:
-            print(f"⚠️  Symbol {signal.symbol} is not visible in Market Watch")
             logger.warning(f"Symbol {signal.symbol} is not visible - attempting to enable")
             # Try to enable it
             if not mt5.symbol_select(signal.symbol, True):
                 logger.error(f"Failed to enable {signal.symbol} in Market Watch")
                 return None
             # Refresh symbol info
-            symbol_info = mt5.symbol_info(signal.symbol)
+            symbol_info = self._get_symbol_info(signal.symbol, refresh=True)
         
         # Check if trading is allowed
         if not symbol_info.trade_mode == mt5.SYMBOL_TRADE_MODE_FULL:
-            print(f"⚠️  Trading is disabled for {signal.symbol} (trade_mode: {symbol_info.trade_mode})")
-            logger.warning(f"Trading disabled for {signal.symbol}")
+            logger.warning(f"Trading disabled for {signal.symbol} (trade_mode: {symbol_info.trade_mode})")
             return None
         
         # Check if market is open
         if symbol_info.trade_mode == mt5.SYMBOL_TRADE_MODE_DISABLED:
-            print(f"⚠️  Market is closed for {signal.symbol}")
             logger.warning(f"Market closed for {signal.symbol}")
             return None
         
         # Validate volume against broker requirements
-        if size < symbol_info.volume_min:
-            msg = f"Volume {size} below minimum {symbol_info.volume_min}, adjusting to minimum"
-            print(msg)
-            logger.info(msg)
-            size = symbol_info.volume_min
-        elif size > symbol_info.volume_max:
-            msg = f"Volume {size} above maximum {symbol_info.volume_max}, adjusting to maximum"
-            print(msg)
-            logger.warning(msg)
-            size = symbol_info.volume_max
+        clamped = min(max(size, symbol_info.volume_min), symbol_info.volume_max)
+        if clamped != size:
+            if clamped > size:
+                logger.info(f"Volume {size} below minimum {symbol_info.volume_min}, adjusting to minimum")
+            else:
+                logger.warning(f"Volume {size} above maximum {symbol_info.volume_max}, adjusting to maximum")
+            size = clamped
         
         # Round to valid step
         if symbol_info.volume_step > 0:
-            size = round(size / symbol_info.volume_step) * symbol_info.volume_step
+            size = _normalize_volume(size, symbol_info.volume_step)
         
         # Check margin requirement
-        account_info = mt5.account_info()
+        account_info = self._get_account_info()
         if account_info:
             # Calculate required margin
             margin_required = mt5.order_calc_margin(
@@ -202,108 +352,155 @@ class TradeManager:
             
             if margin_required is not None:
                 if margin_required > account_info.margin_free:
-                    print(f"⚠️  Insufficient margin for {signal.symbol}: Need ${margin_required:.2f}, Have ${account_info.margin_free:.2f}")
-                    logger.warning(f"Insufficient margin: need {margin_required:.2f}, have {account_info.margin_free:.2f}")
+                    logger.warning(f"Insufficient margin for {signal.symbol}: need {margin_required:.2f}, have {account_info.margin_free:.2f}")
                     return None
                 else:
-                    print(f"💰 Margin OK: Need ${margin_required:.2f}, Have ${account_info.margin_free:.2f}")
+                    logger.info(f"Margin OK: need {margin_required:.2f}, have {account_info.margin_free:.2f}")
         
         msg = f"Opening position: {signal.symbol} {signal.direction} {size} lots (min: {symbol_info.volume_min}, max: {symbol_info.volume_max}, step: {symbol_info.volume_step})"
-        print(msg)
         logger.info(msg)
         
         # Prepare order request
         order_type = mt5.ORDER_TYPE_BUY if signal.direction == "BUY" else mt5.ORDER_TYPE_SELL
         
         # Determine appropriate filling mode for this symbol
-        filling_type = symbol_info.filling_mode
-        
-        # Try different filling modes in order of preference
-        # Check which filling modes are supported (bit flags)
-        if filling_type & 1:  # FOK (Fill or Kill)
-            type_filling = mt5.ORDER_FILLING_FOK
-        elif filling_type & 2:  # IOC (Immediate or Cancel)
-            type_filling = mt5.ORDER_FILLING_IOC
-        else:  # Return
-            type_filling = mt5.ORDER_FILLING_RETURN
+        type_filling = self._get_type_filling(signal.symbol, symbol_info)
         
         # Prepare comment (max 31 characters, ASCII only)
         comment = signal.reason[:20] if signal.reason else "Scalper"
         # Remove any special characters that might cause issues
-        comment = ''.join(c for c in comment if c.isalnum() or c in ['_', '-', ' '])
-        
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": signal.symbol,
-            "volume": size,
-            "type": order_type,
-            "price": signal.entry_price,
-            "sl": signal.stop_loss,
-            "tp": signal.take_profit,
-            "deviation": 20,
-            "magic": 234000,
-            "comment": comment,
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": type_filling,
-        }
+        comment = comment.encode("ascii", "ignore").translate(None, _COMMENT_DROP).decode("ascii")
+        
+        request = dict(
+            self._order_template(signal.symbol, type_filling),
+            volume=size,
+            type=order_type,
+            price=signal.entry_price,
+            sl=signal.stop_loss,
+            tp=signal.take_profit,
+            comment=comment,
+        )
         
         # Attempt to send order with retries
+        result = self._send_with_retry(request, "Order")
+        if result is None:
+            logger.error(f"Failed to open position for {signal.symbol}")
+            self._forget_symbol(signal.symbol)
+            return None
+        
+        # Order successful - create position object
+        position = Position(
+            ticket=result.order,
+            symbol=signal.symbol,
+            direction=signal.direction,
+            volume=size,
+            entry_price=result.price,
+            current_price=result.price,
+            stop_loss=signal.stop_loss,
+            take_profit=signal.take_profit,
+            profit=0.0,
+            open_time=datetime.now()
+        )
+        
+        # Store position
+        self._positions[result.order] = position
+        
+        logger.info(f"Position opened: {signal.symbol} {signal.direction} {size} lots @ {result.price}")
+        return position
+    
+    def _send_with_retry(self, request: Dict, label: str, record=None):
+        """
+        Send an order request, retrying transient failures with backoff.
+        
+        Requotes, price changes, timeouts and connection errors are retried
+        after a jittered exponential delay; failures listed as unrecoverable
+        stop immediately. After a price rejection the request is resent at
+        the current tick price.
+        
+        Args:
+            request: MT5 order request
+            label: Order kind used in log messages ("Order", "Close order")
+            record: Called as record(monotonic time, filled) for each fill or
+                outage; defaults to updating the circuit breaker. Worker
+                threads pass a collector so shared state stays on the caller
+            
+        Returns:
+            The successful order_send result, or None
+        """
+        if record is None:
+            record = self._record_send_outcome
+        symbol = request["symbol"]
+        requoted = False
         for attempt in range(self._retry_attempts):
+            if attempt:
+                time.sleep(_backoff_delay(attempt - 1))
+                if self._circuit_open():
+                    return None
+            
+            if requoted:
+                # Take the price from the latest tick, after the backoff
+                tick = mt5.symbol_info_tick(symbol)
+                if tick is not None:
+                    request["price"] = tick.ask if request["type"] == mt5.ORDER_TYPE_BUY else tick.bid
+            
             result = mt5.order_send(request)
             
             if result is None:
                 # Get detailed error from MT5
                 error = mt5.last_error()
-                msg = f"Order send failed (attempt {attempt + 1}): No result - MT5 Error: {error}"
-                print(msg)
+                msg = f"{label} send failed (attempt {attempt + 1}): No result - MT5 Error: {error}"
                 logger.error(msg)
-                
-                # Check specific error conditions
-                if error[0] == 10018:  # Market is closed
-                    print(f"⚠️  Market is closed for {signal.symbol}")
-                    logger.warning(f"Market is closed for {signal.symbol}")
-                    return None  # Don't retry if market is closed
-                elif error[0] == 10019:  # No prices
-                    print(f"⚠️  No prices available for {signal.symbol}")
-                    logger.warning(f"No prices available for {signal.symbol}")
-                    return None
-                elif error[0] == 10013:  # Invalid request
-                    print(f"⚠️  Invalid request for {signal.symbol}")
-                    logger.warning(f"Invalid request for {signal.symbol}")
-                    return None
-                
-                continue
-            
-            if result.retcode == mt5.TRADE_RETCODE_DONE:
-                # Order successful - create position object
-                position = Position(
-                    ticket=result.order,
-                    symbol=signal.symbol,
-                    direction=signal.direction,
-                    volume=size,
-                    entry_price=result.price,
-                    current_price=result.price,
-                    stop_loss=signal.stop_loss,
-                    take_profit=signal.take_profit,
-                    profit=0.0,
-                    open_time=datetime.now()
-                )
-                
-                # Store position
-                self._positions[result.order] = position
-                
-                print(f"✅ Position opened: {signal.symbol} {signal.direction} {size} lots @ {result.price}")
-                logger.info(f"Position opened: {signal.symbol} {signal.direction} {size} lots @ {result.price}")
-                return position
+                reason = _UNRECOVERABLE_SEND_ERRORS.get(error[0])
+                if reason is None:
+                    record(time.monotonic(), False)
+            elif result.retcode == mt5.TRADE_RETCODE_DONE:
+                record(time.monotonic(), True)
+                return result
             else:
-                msg = f"Order failed (attempt {attempt + 1}): {result.retcode} - {result.comment}"
-                print(msg)
+                msg = f"{label} failed (attempt {attempt + 1}): {result.retcode} - {result.comment}"
                 logger.error(msg)
+                reason = _UNRECOVERABLE_RETCODES.get(result.retcode)
+                requoted = result.retcode in _REQUOTE_RETCODES
+                if result.retcode in _OUTAGE_RETCODES:
+                    record(time.monotonic(), False)
+            
+            if reason:
+                # Don't retry what cannot succeed
+                logger.warning(f"{reason} for {symbol}")
+                return None
         
-        print(f"❌ Failed to open position after {self._retry_attempts} attempts")
-        logger.error(f"Failed to open position after {self._retry_attempts} attempts")
+        logger.error(f"{label} for {symbol} failed after {self._retry_attempts} attempts")
         return None
     
+    def _record_send_outcome(self, at: float, filled: bool) -> None:
+        """
+        Update the circuit breaker and account snapshot after a send.
+        
+        Args:
+            at: time.monotonic() of the send
+            filled: True for a fill, False for a send that failed for lack of
+                a broker connection
+        """
+        if filled:
+            self._failure_times.clear()
+            # The fill changed margin; the next order must see fresh account info
+            self._account_info_cache = (float("-inf"), None)
+            return
+        
+        # Outage; open the circuit if they pile up
+        self._failure_times.append(at)
+        if len(self._failure_times) == _CIRCUIT_FAILURES and at - self._failure_times[0] <= _CIRCUIT_WINDOW:
+            self._circuit_open_until = at + _CIRCUIT_COOLDOWN
+            self._failure_times.clear()
+            logger.warning("Broker unreachable: pausing order sends for %.0fs", _CIRCUIT_COOLDOWN)
+    
+    def _circuit_open(self) -> bool:
+        """True while sends are paused after repeated broker outages."""
+        if time.monotonic() < self._circuit_open_until:
+            logger.warning("Order rejected: broker circuit open")
+            return True
+        return False
+    
     def close_position(self, position: Position) -> Optional[TradeResult]:
         """
         Close an open position.
@@ -314,157 +511,242 @@ class TradeManager:
         Returns:
             TradeResult if successful, None otherwise
         """
-        from src.logger import logger
-        
         # First check if position still exists in MT5
         mt5_position = mt5.positions_get(ticket=position.ticket)
         if mt5_position is None or len(mt5_position) == 0:
-            # Position already closed (probably by SL/TP)
-            print(f"Position {position.ticket} already closed by broker")
+            return self._record_broker_close(position)
+        
+        return self._send_close(position)
+    
+    def _record_broker_close(self, position: Position) -> Optional[TradeResult]:
+        """
+        Record a position the broker already closed (SL/TP) from deal history.
+        
+        Args:
+            position: Position no longer open in MT5
             
-            # Get the actual close info from history
-            from_date = position.open_time
-            to_date = datetime.now()
-            deals = mt5.history_deals_get(position=position.ticket)
+        Returns:
+            TradeResult if the closing deal was found, None otherwise
+        """
+        # Position already closed (probably by SL/TP)
+        logger.info(f"Position {position.ticket} already closed by broker")
+        
+        # Get the actual close info from history
+        close_deal = self._get_close_deal(position.ticket)
+        
+        if close_deal is not None:
+            close_price = close_deal.price
+            profit = close_deal.profit
             
-            if deals and len(deals) > 0:
-                # Find the closing deal
-                close_deal = deals[-1]  # Last deal is the close
-                close_price = close_deal.price
-                profit = close_deal.profit
-                
-                # Update progressive multiplier (per symbol)
-                self._update_progressive_multiplier(position.symbol, profit > 0)
-                
-                # Remove from our tracking
-                if position.ticket in self._positions:
-                    del self._positions[position.ticket]
-                
-                # Create trade result
-                trade_result = TradeResult(
-                    ticket=position.ticket,
-                    symbol=position.symbol,
-                    direction=position.direction,
-                    volume=position.volume,
-                    entry_price=position.entry_price,
-                    exit_price=close_price,
-                    profit=profit,
-                    open_time=position.open_time,
-                    close_time=datetime.now(),
-                    exit_reason="Broker SL/TP"
-                )
-                
-                if self._progressive_sizing_enabled:
-                    symbol_wins = self._symbol_wins.get(position.symbol, 0)
-                    next_lot = self._base_lot_size * self._symbol_multipliers.get(position.symbol, 1.0)
-                    msg = f"Position auto-closed: {position.symbol} @ {close_price}, Profit: {profit:.2f} | {position.symbol} Wins: {symbol_wins}, Next lot: {next_lot:.2f}"
-                    print(msg)
-                    logger.info(msg)
-                else:
-                    msg = f"Position auto-closed: {position.symbol} @ {close_price}, Profit: {profit:.2f}"
-                    print(msg)
-                    logger.info(msg)
-                
-                return trade_result
-            else:
-                # Can't find close info, just remove from tracking
-                if position.ticket in self._positions:
-                    del self._positions[position.ticket]
-                return None
+            # Update progressive multiplier (per symbol)
+            self._update_progressive_multiplier(position.symbol, profit > 0)
+            
+            # Remove from our tracking
+            if position.ticket in self._positions:
+                del self._positions[position.ticket]
+            
+            # Create trade result
+            trade_result = TradeResult(
+                ticket=position.ticket,
+                symbol=position.symbol,
+                direction=position.direction,
+                volume=position.volume,
+                entry_price=position.entry_price,
+                exit_price=close_price,
+                profit=profit,
+                open_time=position.open_time,
+                close_time=datetime.now(),
+                exit_reason="Broker SL/TP"
+            )
+            
+            self._log_close("Position auto-closed", position.symbol, close_price, profit)
+            
+            return trade_result
+        else:
+            # Can't find close info, just remove from tracking
+            if position.ticket in self._positions:
+                del self._positions[position.ticket]
+            return None
+    
+    def _get_close_deal(self, ticket: int, deals=None):
+        """
+        Get the deal that closed a position, querying history at most once per ticket.
+        
+        Args:
+            ticket: Position ticket
+            deals: The position's deals when already fetched in a batch
+            
+        Returns:
+            The closing deal, or None if history has none yet
+        """
+        close_deal = self._close_deals.get(ticket)
+        if close_deal is not None:
+            return close_deal
         
-        # Position still exists, close it manually
-        order_type = mt5.ORDER_TYPE_SELL if position.direction == "BUY" else mt5.ORDER_TYPE_BUY
+        if deals is None:
+            deals = mt5.history_deals_get(position=ticket)
+        if not deals or len(deals) == 0:
+            # Not cached, so a later call can retry once the deal reaches history
+            return None
+        
+        close_deal = deals[-1]  # Last deal is the close
+        self._close_deals[ticket] = close_deal
+        if len(self._close_deals) > _CLOSE_DEAL_CACHE_SIZE:
+            self._close_deals.popitem(last=False)
+        return close_deal
+    
+    def _log_close(self, prefix: str, symbol: str, close_price: float, profit: float) -> None:
+        """Log a closed position, with the symbol's progressive sizing status when enabled."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        
+        if self._progressive_sizing_enabled:
+            streak = self._symbol_streaks.get(symbol) or _SymbolStreak()
+            next_lot = self._base_lot_size * streak.multiplier
+            logger.info("%s: %s @ %s, Profit: %.2f | %s Wins: %s, Next lot: %.2f",
+                        prefix, symbol, close_price, profit, symbol, streak.wins, next_lot)
+        else:
+            logger.info("%s: %s @ %s, Profit: %.2f", prefix, symbol, close_price, profit)
+    
+    def _order_template(self, symbol: str, type_filling: int) -> Dict:
+        """Market-order fields that never change for a symbol, built once and copied per order."""
+        key = (symbol, type_filling)
+        template = self._request_templates.get(key)
+        if template is None:
+            template = {
+                "action": mt5.TRADE_ACTION_DEAL,
+                "symbol": symbol,
+                "deviation": 20,
+                "magic": 234000,
+                "type_time": mt5.ORDER_TIME_GTC,
+                "type_filling": type_filling,
+            }
+            self._request_templates[key] = template
+        return template
+    
+    def _sltp_template(self, symbol: str, type_filling: int) -> Dict:
+        """Stop-modification fields that never change for a symbol, built once and copied per update."""
+        key = (symbol, type_filling)
+        template = self._sltp_templates.get(key)
+        if template is None:
+            template = {
+                "action": mt5.TRADE_ACTION_SLTP,
+                "symbol": symbol,
+                "type_filling": type_filling,
+            }
+            self._sltp_templates[key] = template
+        return template
+    
+    def _build_close_request(self, position: Position, close_price: float, type_filling: int) -> Dict:
+        """Build the opposite-side market order that closes a position."""
+        return dict(
+            self._order_template(position.symbol, type_filling),
+            volume=position.volume,
+            type=mt5.ORDER_TYPE_SELL if position.direction == "BUY" else mt5.ORDER_TYPE_BUY,
+            position=position.ticket,
+            price=close_price,
+            comment="Scalper close",
+        )
+    
+    def _send_close(self, position: Position, tick=None) -> Optional[TradeResult]:
+        """
+        Close a position that is still open in MT5 with a market order.
+        
+        Args:
+            position: Position to close
+            tick: Current tick for the symbol, fetched here when not given
+            
+        Returns:
+            TradeResult if successful, None otherwise
+        """
+        request = self._prepare_close(position, tick)
+        if request is None:
+            return None
+        
+        # Attempt to close with retries
+        result = self._send_with_retry(request, "Close order")
+        return self._finish_close(position, request, result)
+    
+    def _prepare_close(self, position: Position, tick=None) -> Optional[Dict]:
+        """
+        Build the market order that closes a position.
+        
+        Args:
+            position: Position to close
+            tick: Current tick for the symbol, fetched here when not given
+            
+        Returns:
+            The close request, or None while the circuit is open or without a price
+        """
+        if self._circuit_open():
+            return None
         
         # Get current price
-        tick = mt5.symbol_info_tick(position.symbol)
         if tick is None:
-            print(f"Failed to get current price for {position.symbol}")
+            tick = mt5.symbol_info_tick(position.symbol)
+        if tick is None:
+            logger.error(f"Failed to get current price for {position.symbol}")
             return None
         
         close_price = tick.bid if position.direction == "BUY" else tick.ask
         
         # Get symbol info for filling mode
-        symbol_info = mt5.symbol_info(position.symbol)
-        if symbol_info:
-            filling_type = symbol_info.filling_mode
-            # Check which filling modes are supported (bit flags)
-            if filling_type & 1:  # FOK (Fill or Kill)
-                type_filling = mt5.ORDER_FILLING_FOK
-            elif filling_type & 2:  # IOC (Immediate or Cancel)
-                type_filling = mt5.ORDER_FILLING_IOC
-            else:  # Return
-                type_filling = mt5.ORDER_FILLING_RETURN
-        else:
-            type_filling = mt5.ORDER_FILLING_RETURN
-        
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": position.symbol,
-            "volume": position.volume,
-            "type": order_type,
-            "position": position.ticket,
-            "price": close_price,
-            "deviation": 20,
-            "magic": 234000,
-            "comment": "Scalper close",
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": type_filling,
-        }
+        symbol_info = self._get_symbol_info(position.symbol)
+        type_filling = self._get_type_filling(position.symbol, symbol_info)
         
-        # Attempt to close with retries
-        for attempt in range(self._retry_attempts):
-            result = mt5.order_send(request)
-            
-            if result is None:
-                print(f"Close order failed (attempt {attempt + 1}): No result")
-                continue
+        return self._build_close_request(position, close_price, type_filling)
+    
+    def _finish_close(self, position: Position, request: Dict, result) -> Optional[TradeResult]:
+        """
+        Record the outcome of a close order.
+        
+        Args:
+            position: Position the order closed
+            request: The close request after sending; a requote leaves the
+                price it was finally filled at
+            result: The successful order_send result, or None if the close failed
             
-            if result.retcode == mt5.TRADE_RETCODE_DONE:
-                # Calculate profit
-                if position.direction == "BUY":
-                    profit = (close_price - position.entry_price) * position.volume * 100000  # Simplified
-                else:
-                    profit = (position.entry_price - close_price) * position.volume * 100000
-                
-                # Update progressive multiplier based on result (per symbol)
-                self._update_progressive_multiplier(position.symbol, profit > 0)
-                
-                # Create trade result
-                trade_result = TradeResult(
-                    ticket=position.ticket,
-                    symbol=position.symbol,
-                    direction=position.direction,
-                    volume=position.volume,
-                    entry_price=position.entry_price,
-                    exit_price=close_price,
-                    profit=profit,
-                    open_time=position.open_time,
-                    close_time=datetime.now(),
-                    exit_reason="Manual close"
-                )
-                
-                # Remove from positions
-                if position.ticket in self._positions:
-                    del self._positions[position.ticket]
-                
-                # Show progressive sizing status (per symbol)
-                if self._progressive_sizing_enabled:
-                    symbol_wins = self._symbol_wins.get(position.symbol, 0)
-                    next_lot = self._base_lot_size * self._symbol_multipliers.get(position.symbol, 1.0)
-                    msg = f"Position closed: {position.symbol} @ {close_price}, Profit: {profit:.2f} | {position.symbol} Wins: {symbol_wins}, Next lot: {next_lot:.2f}"
-                    print(msg)
-                    logger.info(msg)
-                else:
-                    msg = f"Position closed: {position.symbol} @ {close_price}, Profit: {profit:.2f}"
-                    print(msg)
-                    logger.info(msg)
-                
-                return trade_result
-            else:
-                print(f"Close failed (attempt {attempt + 1}): {result.retcode} - {result.comment}")
+        Returns:
+            TradeResult if the position closed, None otherwise
+        """
+        if result is None:
+            logger.error(f"Failed to close position {position.ticket}")
+            self._forget_symbol(position.symbol)
+            return None
         
-        print(f"Failed to close position after {self._retry_attempts} attempts")
-        return None
+        close_price = request["price"]
+        
+        # Calculate profit
+        if position.direction == "BUY":
+            profit = (close_price - position.entry_price) * position.volume * 100000  # Simplified
+        else:
+            profit = (position.entry_price - close_price) * position.volume * 100000
+        
+        # Update progressive multiplier based on result (per symbol)
+        self._update_progressive_multiplier(position.symbol, profit > 0)
+        
+        # Create trade result
+        trade_result = TradeResult(
+            ticket=position.ticket,
+            symbol=position.symbol,
+            direction=position.direction,
+            volume=position.volume,
+            entry_price=position.entry_price,
+            exit_price=close_price,
+            profit=profit,
+            open_time=position.open_time,
+            close_time=datetime.now(),
+            exit_reason="Manual close"
+        )
+        
+        # Remove from positions
+        if position.ticket in self._positions:
+            del self._positions[position.ticket]
+        
+        # Show progressive sizing status (per symbol)
+        self._log_close("Position closed", position.symbol, close_price, profit)
+        
+        return trade_result
     
     def get_open_positions(self) -> List[Position]:
         """Get list of all open positions and sync with MT5."""
@@ -474,37 +756,68 @@ class TradeManager:
         if mt5_positions is None:
             mt5_positions = []
         
-        # Create set of MT5 ticket numbers
-        mt5_tickets = {pos.ticket for pos in mt5_positions}
+        # Index MT5 positions by ticket; the account may hold positions that aren't ours
+        mt5_by_ticket = {pos.ticket: pos for pos in mt5_positions}
         
-        # Remove positions from our tracking that no longer exist in MT5
-        closed_tickets = []
-        for ticket in list(self._positions.keys()):
-            if ticket not in mt5_tickets:
-                closed_tickets.append(ticket)
+        # Tracked tickets that no longer exist in MT5. The C-level set difference
+        # settles the usual nothing-closed case; otherwise keep opening order so
+        # progressive sizing sees the closes in sequence
+        closed = self._positions.keys() - mt5_by_ticket.keys()
+        closed_tickets = [ticket for ticket in self._positions if ticket in closed] if closed else []
         
         # Handle positions that were closed by broker
+        deals_by_position = self._closing_history(closed_tickets)
         for ticket in closed_tickets:
             position = self._positions[ticket]
             # Try to get close info from history
-            deals = mt5.history_deals_get(position=ticket)
-            if deals and len(deals) > 0:
-                close_deal = deals[-1]
+            if deals_by_position is None:
+                close_deal = self._get_close_deal(ticket)
+            else:
+                close_deal = self._get_close_deal(ticket, deals_by_position.get(ticket))
+            if close_deal is not None:
                 profit = close_deal.profit
                 self._update_progressive_multiplier(position.symbol, profit > 0)
-                print(f"Position {ticket} was closed by broker, Profit: {profit:.2f}")
+                logger.info(f"Position {ticket} was closed by broker, Profit: {profit:.2f}")
             
             del self._positions[ticket]
         
-        # Update current prices and profits for existing positions
-        for mt5_pos in mt5_positions:
-            if mt5_pos.ticket in self._positions:
-                position = self._positions[mt5_pos.ticket]
-                position.current_price = mt5_pos.price_current
-                position.profit = mt5_pos.profit
+        # Update current prices and profits; every remaining position is still open in MT5
+        for ticket, position in self._positions.items():
+            mt5_pos = mt5_by_ticket[ticket]
+            position.current_price = mt5_pos.price_current
+            position.profit = mt5_pos.profit
         
         return list(self._positions.values())
     
+    def _closing_history(self, tickets: List[int]) -> Optional[Dict[int, list]]:
+        """
+        Fetch deal history for several closed positions in one request.
+        
+        Args:
+            tickets: Tickets of positions closed since the last sync
+            
+        Returns:
+            Deals grouped by position ticket in time order, or None when a
+            per-position lookup is needed (single ticket or failed request)
+        """
+        if len(tickets) < 2:
+            return None
+        
+        # The window spans every position's lifetime; a day of slack on each
+        # side covers broker server time offsets
+        date_from = min(self._positions[ticket].open_time for ticket in tickets) - timedelta(days=1)
+        date_to = datetime.now() + timedelta(days=1)
+        deals = mt5.history_deals_get(date_from, date_to)
+        if deals is None:
+            return None
+        
+        wanted = set(tickets)
+        deals_by_position: Dict[int, list] = {}
+        for deal in deals:
+            if deal.position_id in wanted:
+                deals_by_position.setdefault(deal.position_id, []).append(deal)
+        return deals_by_position
+    
     def monitor_positions(self) -> None:
         """
         Monitor open positions and update their status.
@@ -524,8 +837,6 @@ class TradeManager:
         Returns:
             True if successful, False otherwise
         """
-        from src.logger import logger
-        
         # Verify position still exists
         mt5_position = mt5.positions_get(ticket=position.ticket)
         if mt5_position is None or len(mt5_position) == 0:
@@ -533,27 +844,16 @@ class TradeManager:
             return False
         
         # Get symbol info for filling mode
-        symbol_info = mt5.symbol_info(position.symbol)
-        if symbol_info:
-            filling_type = symbol_info.filling_mode
-            if filling_type & 1:
-                type_filling = mt5.ORDER_FILLING_FOK
-            elif filling_type & 2:
-                type_filling = mt5.ORDER_FILLING_IOC
-            else:
-                type_filling = mt5.ORDER_FILLING_RETURN
-        else:
-            type_filling = mt5.ORDER_FILLING_RETURN
+        symbol_info = self._get_symbol_info(position.symbol)
+        type_filling = self._get_type_filling(position.symbol, symbol_info)
         
         # Prepare modification request
-        request = {
-            "action": mt5.TRADE_ACTION_SLTP,
-            "symbol": position.symbol,
-            "position": position.ticket,
-            "sl": new_stop_loss,
-            "tp": position.take_profit,
-            "type_filling": type_filling,
-        }
+        request = dict(
+            self._sltp_template(position.symbol, type_filling),
+            position=position.ticket,
+            sl=new_stop_loss,
+            tp=position.take_profit,
+        )
         
         # Send modification request
         result = mt5.order_send(request)
@@ -578,15 +878,97 @@ class TradeManager:
         """
         Close all open positions.
         
+        Close orders for different symbols are sent concurrently; everything
+        else (tracking, sizing streaks, circuit breaker) runs on this thread.
+        
         Returns:
             List of TradeResult objects
         """
         results = []
         positions = list(self._positions.values())
         
+        # One snapshot of open tickets instead of a positions_get round-trip per position
+        mt5_positions = mt5.positions_get()
+        if mt5_positions is None:
+            # Snapshot failed; fall back to checking each position
+            for position in positions:
+                result = self.close_position(position)
+                if result:
+                    results.append(result)
+            return results
+        
+        open_tickets = {pos.ticket for pos in mt5_positions}
+        
+        # Build close requests in opening order, with one tick per symbol; a
+        # price that moves mid-flatten is caught by the requote retry
+        ticks = {}
+        planned = []  # (position, request); no request if the broker already closed it
+        requests_by_symbol: Dict[str, List[Dict]] = {}
         for position in positions:
-            result = self.close_position(position)
+            if position.ticket not in open_tickets:
+                planned.append((position, None))
+                continue
+            if position.symbol not in ticks:
+                ticks[position.symbol] = mt5.symbol_info_tick(position.symbol)
+            request = self._prepare_close(position, ticks[position.symbol])
+            if request is None:
+                continue
+            planned.append((position, request))
+            requests_by_symbol.setdefault(position.symbol, []).append(request)
+        
+        # order_send blocks on the terminal round-trip; overlap those across symbols
+        groups = list(requests_by_symbol.values())
+        if len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=min(_MAX_CLOSE_WORKERS, len(groups)),
+                                    thread_name_prefix="close-all") as executor:
+                sent = list(executor.map(self._send_closes, groups))
+        else:
+            sent = [self._send_closes(group) for group in groups]
+        
+        outcomes = {}  # id(request) -> order_send result
+        events = []
+        for group, group_sent in zip(groups, sent):
+            for request, (result, group_events) in zip(group, group_sent):
+                outcomes[id(request)] = result
+                events.extend(group_events)
+        
+        # Apply fills and outages in the order they happened
+        for at, filled in sorted(events):
+            self._record_send_outcome(at, filled)
+        
+        # Record closes in opening order so each symbol's streak sees them in sequence
+        for position, request in planned:
+            if request is None:
+                result = self._record_broker_close(position)
+            else:
+                result = self._finish_close(position, request, outcomes[id(request)])
             if result:
                 results.append(result)
         
         return results
+    
+    def _send_closes(self, requests: List[Dict]) -> List[Tuple[Any, List[Tuple[float, bool]]]]:
+        """
+        Send one symbol's close orders in turn; safe to run on a worker thread.
+        
+        Only talks to the terminal: fills and outages are collected for the
+        caller to apply instead of touching shared state.
+        
+        Args:
+            requests: Close requests for the same symbol
+            
+        Returns:
+            (order_send result or None, [(monotonic time, filled)]) per request
+        """
+        sent = []
+        for request in requests:
+            events = []
+            try:
+                result = self._send_with_retry(request, "Close order",
+                                               lambda at, filled: events.append((at, filled)))
+            except Exception as e:
+                # Keep the other closes of the flatten
+                logger.error(f"Close order for {request['symbol']} raised: {e}")
+                result = None
+            sent.append((result, events))
+        return sent
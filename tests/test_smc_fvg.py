@@ -1,9 +1,10 @@
 """Property-based tests for FVG Detector using Hypothesis."""
 
+import numpy as np
 import pytest
 from hypothesis import given, strategies as st
 from datetime import datetime
-from src.smc_strategy import FVG, FVGDetector
+from src.smc_strategy import FVG, FVGDetector, candles_to_soa, fvg_columns
 
 
 # Feature: smc-strategy, Property 2: FVG Level Calculation
@@ -199,6 +200,142 @@ def test_fvg_detection_with_real_candles():
     assert abs(fvgs[0].equilibrium - 107.5) < 0.01
 
 
+
+
+def test_fvg_below_min_size_ignored():
+    """Unit test: Gaps smaller than fvg_min_size_pips are not reported."""
+    detector = FVGDetector()
+    
+    # Candle 0 high (1.10000) < Candle 2 low (1.10002): a 0.2 pip gap
+    candles = [
+        {'open': 1.09990, 'high': 1.10000, 'low': 1.09980, 'close': 1.09995},
+        {'open': 1.09995, 'high': 1.10010, 'low': 1.09990, 'close': 1.10008},
+        {'open': 1.10008, 'high': 1.10020, 'low': 1.10002, 'close': 1.10015},
+    ]
+    
+    assert detector.detect_fvgs(candles, "M5") == []
+
+
+def test_fvgs_ordered_by_distance():
+    """Unit test: Nearest FVG and distance ordering use the equilibrium level."""
+    detector = FVGDetector()
+    
+    def make_fvg(low, high):
+        return FVG("M15", "BULLISH", high, low, (high + low) / 2, datetime.now(), False, 0)
+    
+    far = make_fvg(90.0, 92.0)     # equilibrium 91
+    near = make_fvg(104.0, 106.0)  # equilibrium 105
+    mid = make_fvg(94.0, 96.0)     # equilibrium 95
+    fvgs = [far, near, mid]
+    
+    assert detector.get_nearest_fvg(fvgs, 103.0) is near
+    assert detector.prioritize_by_distance(fvgs, 103.0) == [near, mid, far]
+    assert detector.prioritize_by_distance([], 103.0) == []
+
+
+def test_fvg_detection_memoized_per_symbol():
+    """Unit test: Repeated detection on unchanged candles reuses the memoized FVGs."""
+    detector = FVGDetector()
+    candles = [
+        {'time': 1, 'open': 100, 'high': 105, 'low': 95, 'close': 102},
+        {'time': 2, 'open': 102, 'high': 110, 'low': 100, 'close': 108},
+        {'time': 3, 'open': 115, 'high': 125, 'low': 110, 'close': 120},
+    ]
+    
+    first = detector.detect_fvgs(candles, "M15", "US30")
+    second = detector.detect_fvgs(list(candles), "M15", "US30")
+    assert len(first) == 1
+    assert second[0] is first[0]
+    
+    # A new last candle invalidates the entry
+    candles.append({'time': 4, 'open': 120, 'high': 130, 'low': 126, 'close': 128})
+    third = detector.detect_fvgs(candles, "M15", "US30")
+    assert len(third) == 2
+    assert third[0] is not first[0]
+
+def test_candles_to_soa_conversion():
+    """Unit test: Verify candles convert to OHLC arrays and the conversion is reused."""
+    candles = [
+        {'open': 100, 'high': 105, 'low': 95, 'close': 102},
+        {'open': 102, 'high': 110, 'low': 100, 'close': 108},
+    ]
+    
+    o, h, l, c = candles_to_soa(candles)
+    
+    assert o.tolist() == [100.0, 102.0]
+    assert h.tolist() == [105.0, 110.0]
+    assert l.tolist() == [95.0, 100.0]
+    assert c.tolist() == [102.0, 108.0]
+    assert candles_to_soa(candles)[1] is h
+    
+    # Appending a candle must invalidate the cached conversion
+    candles.append({'open': 108, 'high': 112, 'low': 107, 'close': 111})
+    assert candles_to_soa(candles)[1].tolist() == [105.0, 110.0, 112.0]
+
+def test_candles_to_soa_accepts_mt5_rates():
+    """Unit test: Verify an MT5 rates structured array converts like a list of dicts."""
+    rates = np.array(
+        [(1700000000, 100.0, 105.0, 95.0, 102.0, 10),
+         (1700003600, 102.0, 110.0, 100.0, 108.0, 12)],
+        dtype=[('time', 'i8'), ('open', 'f8'), ('high', 'f8'), ('low', 'f8'),
+               ('close', 'f8'), ('tick_volume', 'u8')]
+    )
+    
+    o, h, l, c = candles_to_soa(rates)
+    
+    assert o.tolist() == [100.0, 102.0]
+    assert h.tolist() == [105.0, 110.0]
+    assert l.tolist() == [95.0, 100.0]
+    assert c.tolist() == [102.0, 108.0]
+    assert h.flags.c_contiguous
+
+def test_detect_fvgs_batch_matches_single():
+    """Unit test: Verify batched detection matches per-symbol detection."""
+    up = [
+        {'open': 100, 'high': 101, 'low': 99, 'close': 100.5},
+        {'open': 100.5, 'high': 106, 'low': 100.5, 'close': 105.5},
+        {'open': 105.5, 'high': 108, 'low': 103, 'close': 107},
+        {'open': 107, 'high': 109, 'low': 106, 'close': 108},
+    ]
+    down = [{'open': c['close'], 'high': 300 - c['low'], 'low': 300 - c['high'],
+             'close': c['open']} for c in up]
+    short = up[:2]
+    
+    detector = FVGDetector()
+    batch = detector.detect_fvgs_batch({"UP": up, "DOWN": down, "SHORT": short}, "H1")
+    
+    single = FVGDetector()
+    for symbol, candles in (("UP", up), ("DOWN", down), ("SHORT", short)):
+        expected = single.detect_fvgs(candles, "H1")
+        assert [(f.direction, f.high, f.low, f.candle_index) for f in batch[symbol]] == \
+            [(f.direction, f.high, f.low, f.candle_index) for f in expected]
+    
+    assert batch["SHORT"] == []
+    # Batched results are memoized for later single-symbol calls
+    assert detector.detect_fvgs(up, "H1", "UP")[0].created_at == batch["UP"][0].created_at
+
+
+def test_detect_fvgs_with_columns_matches_objects():
+    """Unit test: Verify detected column arrays describe the returned FVGs."""
+    candles = [
+        {'open': 100, 'high': 101, 'low': 99, 'close': 100.5},
+        {'open': 100.5, 'high': 106, 'low': 100.5, 'close': 105.5},
+        {'open': 105.5, 'high': 108, 'low': 103, 'close': 107},
+        {'open': 107, 'high': 109, 'low': 106, 'close': 108},
+        {'open': 108, 'high': 108.5, 'low': 101, 'close': 101.5},
+        {'open': 101.5, 'high': 102, 'low': 95, 'close': 96},
+    ]
+    detector = FVGDetector()
+    fvgs, columns = detector.detect_fvgs_with_columns(candles, "H1", "TEST")
+    expected = fvg_columns(fvgs)
+    
+    assert fvgs
+    for name in ("low", "high", "equilibrium", "direction"):
+        np.testing.assert_array_equal(getattr(columns, name), getattr(expected, name))
+    # Cache hits hand back the memoized columns
+    assert detector.detect_fvgs_with_columns(candles, "H1", "TEST")[1] is columns
+
+
 def test_fvg_entry_price():
     """Unit test: Verify entry price calculation for FVGs."""
     detector = FVGDetector()
@@ -278,5 +278,26 @@ def test_swing_points_ordering():
         assert low > 0, "Swing low should be positive"
 
 
+
+def test_structure_reused_for_same_candles():
+    """Unit test: Structure is cached per candle batch and refreshed on new candles."""
+    analyzer = MarketStructureAnalyzer()
+    
+    candles = []
+    for i in range(30):
+        price = 100 + 10 * (i % 5)
+        candles.append({
+            'open': price,
+            'high': price + 2,
+            'low': price - 2,
+            'close': price + 1
+        })
+    
+    structure = analyzer.identify_structure(candles)
+    assert analyzer.identify_structure(candles) is structure
+    
+    candles.append({'open': 150, 'high': 160, 'low': 149, 'close': 158})
+    assert analyzer.identify_structure(candles) is not structure
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--hypothesis-show-statistics"])
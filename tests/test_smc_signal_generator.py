@@ -6,7 +6,7 @@ from datetime import datetime
 from src.smc_strategy import (
     SMCSignal, ConfluenceZone, FVG, OrderBlock,
     FVGDetector, OrderBlockDetector, MarketStructureAnalyzer,
-    MultiTimeframeAnalyzer, SMCSignalGenerator
+    MultiTimeframeAnalyzer, SMCSignalGenerator, TimeframeAnalysis
 )
 
 
@@ -97,6 +97,31 @@ def test_stop_loss_placement(ob_high, ob_low, direction):
             f"Sell stop loss {stop_loss} should be above OB high {ob_high}"
 
 
+def test_stop_loss_falls_back_to_fvg_and_requires_a_zone():
+    """Unit test: Stop loss uses the FVG without an OB and rejects missing zones."""
+    fvg_detector = FVGDetector()
+    ob_detector = OrderBlockDetector()
+    structure_analyzer = MarketStructureAnalyzer()
+    mtf_analyzer = MultiTimeframeAnalyzer(fvg_detector, structure_analyzer)
+    signal_gen = SMCSignalGenerator(fvg_detector, ob_detector, structure_analyzer, mtf_analyzer)
+    
+    fvg = FVG(
+        timeframe="H1",
+        direction="BULLISH",
+        high=110.0,
+        low=100.0,
+        equilibrium=105.0,
+        created_at=datetime.now(),
+        filled=False,
+        candle_index=0
+    )
+    
+    assert signal_gen.calculate_stop_loss("BUY", fvg=fvg) == pytest.approx(99.9)
+    assert signal_gen.calculate_stop_loss("SELL", fvg=fvg) == pytest.approx(110.11)
+    with pytest.raises(ValueError):
+        signal_gen.calculate_stop_loss("BUY")
+
+
 def test_signal_validation():
     """Property: Signal validation should enforce minimum requirements."""
     fvg_detector = FVGDetector()
@@ -265,5 +290,37 @@ def test_entry_price_calculation():
     assert entry == 105.0, f"Entry from OB should be OB entry_price 105.0, got {entry}"
 
 
+def test_analyze_setup_skips_when_nearest_zone_opposes_bias(monkeypatch):
+    """Test that only the nearest confluence zone is traded, and only with the HTF bias."""
+    fvg_detector = FVGDetector()
+    ob_detector = OrderBlockDetector()
+    structure_analyzer = MarketStructureAnalyzer()
+    mtf_analyzer = MultiTimeframeAnalyzer(fvg_detector, structure_analyzer)
+    signal_gen = SMCSignalGenerator(fvg_detector, ob_detector, structure_analyzer, mtf_analyzer)
+    
+    def make_fvg(timeframe, direction, low, high):
+        return FVG(timeframe=timeframe, direction=direction, high=high, low=low,
+                   equilibrium=(high + low) / 2, created_at=datetime.now(),
+                   filled=False, candle_index=0)
+    
+    # Bullish zone 108-112, bearish zone 128-132
+    analysis = TimeframeAnalysis(
+        h4_fvgs=[make_fvg("H4", "BULLISH", 105.0, 115.0), make_fvg("H4", "BEARISH", 125.0, 135.0)],
+        h1_fvgs=[make_fvg("H1", "BULLISH", 108.0, 112.0), make_fvg("H1", "BEARISH", 128.0, 132.0)]
+    )
+    monkeypatch.setattr(mtf_analyzer, "analyze_all_timeframes", lambda symbol, candles: analysis)
+    monkeypatch.setattr(mtf_analyzer, "get_htf_bias", lambda h4, h1: "BULLISH")
+    
+    # Nearest zone is bearish: no trade, even though a bullish zone and bullish H1 FVGs exist
+    assert signal_gen.analyze_setup("TEST", {}, 129.0) is None
+    
+    # Nearest zone agrees with the bias: trade it
+    signal = signal_gen.analyze_setup("TEST", {}, 113.0)
+    assert signal is not None
+    assert signal.direction == "BUY"
+    assert signal.setup_type == "CONFLUENCE"
+    assert signal.zones[0].direction == "BULLISH"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--hypothesis-show-statistics"])
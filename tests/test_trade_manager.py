@@ -6,7 +6,7 @@ from hypothesis import given, settings
 from hypothesis import strategies as st
 from datetime import datetime
 
-from src.trade_manager import TradeManager
+from src.trade_manager import TradeManager, _normalize_volume
 from src.models import Signal, Position
 
 
@@ -228,3 +228,208 @@ def test_position_count_tracking(max_pos):
     
     assert manager.get_position_count() == max_pos - 1
     assert manager.can_open_new_position()
+
+
+@patch('src.trade_manager.time.sleep')
+@patch('src.trade_manager.mt5')
+def test_send_with_retry_backs_off_only_on_recoverable_failures(mock_mt5, mock_sleep):
+    """Test that requotes are retried with backoff and unrecoverable failures are not."""
+    manager = TradeManager()
+    mock_mt5.TRADE_RETCODE_DONE = 10009
+    
+    requote = MagicMock(retcode=10004, comment="Requote")
+    done = MagicMock(retcode=10009, comment="Done")
+    mock_mt5.order_send.side_effect = [requote, done]
+    
+    assert manager._send_with_retry({"symbol": "TEST", "type": 0, "price": 100.0}, "Order") is done
+    assert mock_sleep.call_count == 1
+    assert 0.1 <= mock_sleep.call_args[0][0] <= 0.15
+    
+    # Not enough money: one attempt, no backoff
+    mock_sleep.reset_mock()
+    mock_mt5.order_send.reset_mock()
+    mock_mt5.order_send.side_effect = None
+    mock_mt5.order_send.return_value = MagicMock(retcode=10019, comment="No money")
+    
+    assert manager._send_with_retry({"symbol": "TEST"}, "Order") is None
+    mock_mt5.order_send.assert_called_once()
+    mock_sleep.assert_not_called()
+
+
+@settings(max_examples=100)
+@given(
+    steps=st.integers(min_value=1, max_value=10000),
+    step=st.sampled_from([0.001, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 2.5])
+)
+def test_normalized_volume_has_no_float_residue(steps, step):
+    """Test that normalized volumes are exact multiples printed at the step's precision."""
+    size = _normalize_volume(steps * step, step)
+    
+    assert size == round(size, 3)
+    assert abs(size / step - round(size / step)) < 1e-9
+
+
+@patch('src.trade_manager.time.sleep')
+@patch('src.trade_manager.mt5')
+def test_send_with_retry_requotes_from_fresh_tick(mock_mt5, mock_sleep):
+    """Test that a requoted order is resent at the current tick price."""
+    manager = TradeManager()
+    mock_mt5.TRADE_RETCODE_DONE = 10009
+    mock_mt5.ORDER_TYPE_BUY = 0
+    mock_mt5.symbol_info_tick.return_value = MagicMock(ask=101.5, bid=101.0)
+    
+    sent_prices = []
+    
+    def order_send(request):
+        sent_prices.append(request["price"])
+        return MagicMock(retcode=10004 if len(sent_prices) == 1 else 10009, comment="")
+    
+    mock_mt5.order_send.side_effect = order_send
+    
+    request = {"symbol": "TEST", "type": 0, "price": 100.0}
+    assert manager._send_with_retry(request, "Order") is not None
+    assert sent_prices == [100.0, 101.5]
+
+
+@patch('src.trade_manager.time.sleep')
+@patch('src.trade_manager.mt5')
+def test_requoted_close_records_the_resent_price(mock_mt5, mock_sleep):
+    """Test that a requoted close is recorded at the price it was resent at."""
+    manager = TradeManager()
+    manager.enable_progressive_sizing(True, base_lot=0.01)
+    mock_mt5.TRADE_RETCODE_DONE = 10009
+    mock_mt5.ORDER_TYPE_BUY = 0
+    mock_mt5.ORDER_TYPE_SELL = 1
+    mock_mt5.positions_get.return_value = [MagicMock(ticket=1)]
+    mock_mt5.symbol_info_tick.side_effect = [MagicMock(bid=1.10, ask=1.11), MagicMock(bid=0.95, ask=0.96)]
+    mock_mt5.order_send.side_effect = [MagicMock(retcode=10004, comment="Requote"),
+                                       MagicMock(retcode=10009, comment="Done")]
+    position = _tracked_position(manager, 1, "EURUSD", 1.0)
+    
+    result = manager.close_position(position)
+    
+    assert result.exit_price == 0.95
+    assert result.profit < 0
+    streak = manager._symbol_streaks["EURUSD"]
+    assert (streak.multiplier, streak.losses) == (1.0, 1)
+
+
+@patch('src.trade_manager.time.sleep')
+@patch('src.trade_manager.mt5')
+def test_circuit_opens_after_repeated_outages(mock_mt5, mock_sleep):
+    """Test that repeated connection failures pause sends until the cooldown passes."""
+    manager = TradeManager()
+    mock_mt5.TRADE_RETCODE_DONE = 10009
+    mock_mt5.order_send.return_value = MagicMock(retcode=10031, comment="No connection")
+    
+    request = {"symbol": "TEST", "type": 0, "price": 100.0}
+    manager._send_with_retry(dict(request), "Order")
+    manager._send_with_retry(dict(request), "Order")
+    
+    # Fifth outage opens the circuit; the sixth attempt is never sent
+    assert mock_mt5.order_send.call_count == 5
+    
+    # While open, new orders are rejected before touching the terminal
+    mock_mt5.reset_mock()
+    signal = Signal(symbol="TEST", direction="BUY", entry_price=100.0, stop_loss=99.0,
+                    take_profit=102.0, timestamp=datetime.now(), confidence=1.0, reason="test")
+    assert manager.open_position(signal, 0.01) is None
+    mock_mt5.symbol_info.assert_not_called()
+    mock_mt5.order_send.assert_not_called()
+    
+    # Once the cooldown has passed, sends resume
+    manager._circuit_open_until = 0.0
+    mock_mt5.order_send.return_value = MagicMock(retcode=10009, comment="Done")
+    assert manager._send_with_retry(dict(request), "Order") is not None
+
+
+def _tracked_position(manager, ticket, symbol, entry_price):
+    """Track a 0.01-lot BUY position on the manager."""
+    position = Position(
+        ticket=ticket,
+        symbol=symbol,
+        direction="BUY",
+        volume=0.01,
+        entry_price=entry_price,
+        current_price=entry_price,
+        stop_loss=entry_price * 0.99,
+        take_profit=entry_price * 1.01,
+        profit=0.0,
+        open_time=datetime.now()
+    )
+    manager._positions[ticket] = position
+    return position
+
+
+def _mock_close_all(mock_mt5, open_tickets):
+    """Set up MT5 for close_all_positions: one bid per symbol, fills by default."""
+    mock_mt5.TRADE_RETCODE_DONE = 10009
+    mock_mt5.positions_get.return_value = [MagicMock(ticket=ticket) for ticket in open_tickets]
+    bids = {"EURUSD": 1.10, "GBPUSD": 1.30}
+    mock_mt5.symbol_info_tick.side_effect = lambda symbol: MagicMock(bid=bids[symbol], ask=bids[symbol])
+    mock_mt5.order_send.return_value = MagicMock(retcode=10009, comment="Done")
+
+
+@patch('src.trade_manager.mt5')
+def test_close_all_positions_groups_by_symbol(mock_mt5):
+    """Test that close-all fetches one tick per symbol and records broker closes from the snapshot."""
+    manager = TradeManager()
+    _tracked_position(manager, 1, "EURUSD", 1.0)
+    _tracked_position(manager, 2, "GBPUSD", 1.0)
+    _tracked_position(manager, 3, "EURUSD", 1.0)
+    _tracked_position(manager, 4, "GBPUSD", 1.0)
+    _mock_close_all(mock_mt5, open_tickets=[1, 2, 3])
+    mock_mt5.history_deals_get.return_value = [MagicMock(price=1.25, profit=5.0)]
+    
+    results = manager.close_all_positions()
+    
+    assert [r.ticket for r in results] == [1, 2, 3, 4]
+    assert [r.exit_price for r in results] == [1.10, 1.30, 1.10, 1.25]
+    assert results[3].exit_reason == "Broker SL/TP"
+    assert mock_mt5.positions_get.call_count == 1
+    assert mock_mt5.symbol_info_tick.call_count == 2
+    assert mock_mt5.order_send.call_count == 3
+    assert manager.get_position_count() == 0
+
+
+@patch('src.trade_manager.mt5')
+def test_close_all_positions_keeps_streak_order_per_symbol(mock_mt5):
+    """Test that each symbol's closes reach progressive sizing in opening order."""
+    manager = TradeManager()
+    manager.enable_progressive_sizing(True, base_lot=0.01)
+    # EURUSD bid 1.10: win, win, loss; GBPUSD bid 1.30: loss, win
+    _tracked_position(manager, 1, "EURUSD", 1.0)
+    _tracked_position(manager, 2, "GBPUSD", 1.5)
+    _tracked_position(manager, 3, "EURUSD", 1.0)
+    _tracked_position(manager, 4, "GBPUSD", 1.0)
+    _tracked_position(manager, 5, "EURUSD", 1.5)
+    _mock_close_all(mock_mt5, open_tickets=[1, 2, 3, 4, 5])
+    
+    manager.close_all_positions()
+    
+    eurusd = manager._symbol_streaks["EURUSD"]
+    gbpusd = manager._symbol_streaks["GBPUSD"]
+    assert (eurusd.multiplier, eurusd.wins, eurusd.losses) == (1.0, 0, 1)
+    assert (gbpusd.multiplier, gbpusd.wins, gbpusd.losses) == (2.0, 1, 0)
+
+
+@patch('src.trade_manager.mt5')
+def test_close_all_positions_survives_failing_worker(mock_mt5):
+    """Test that a send raising on one symbol keeps the other symbols' results."""
+    manager = TradeManager()
+    _tracked_position(manager, 1, "EURUSD", 1.0)
+    _tracked_position(manager, 2, "GBPUSD", 1.0)
+    _mock_close_all(mock_mt5, open_tickets=[1, 2])
+    done = MagicMock(retcode=10009, comment="Done")
+    
+    def order_send(request):
+        if request["symbol"] == "GBPUSD":
+            raise RuntimeError("terminal disconnected")
+        return done
+    
+    mock_mt5.order_send.side_effect = order_send
+    
+    results = manager.close_all_positions()
+    
+    assert [r.ticket for r in results] == [1]
+    assert list(manager._positions) == [2]